@@ -0,0 +1,234 @@
+"""Benchmarks for the manim_ace building blocks and a couple of whole scenes.
+
+Every primitive is built at several sizes, from cold caches, and we measure
+how long that takes, how much memory it peaks at, and how long drawing one
+frame of the result takes. The scenes are rendered end to end at low
+quality.
+
+    python benchmarks/run.py                  # compare with baseline.json
+    python benchmarks/run.py --save           # make the results the baseline
+    python benchmarks/run.py -k code_window   # only some of the benchmarks
+
+Anything that got slower (or bigger) than the baseline by more than the
+threshold is reported, and the exit status is 1.
+
+Timings depend on the machine, so baseline.json is not part of the
+repository. The first run on a machine, with no baseline yet, saves its
+results as the baseline. So do benchmarks that are new to it.
+"""
+import argparse
+import gc
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from manim import *
+
+import manim_ace.code
+import manim_ace.highlight
+import manim_ace.variables
+from manim_ace.code import CodeWindow
+from manim_ace.glyphs import clear_text_cache
+from manim_ace.lists import List
+from manim_ace.loops import ForRange
+from manim_ace.render import render_scene
+from manim_ace.variables import VariableBox, VariableScope, code_value
+
+BASELINE = Path(__file__).resolve().parent / 'baseline.json'
+DEFAULT_THRESHOLD = 1.25
+
+# name -> (builder, sizes)
+PRIMITIVES = {}
+# name -> (module file, scene class)
+SCENES = {
+    'scene/sample_code.ExampleScene': ('sample_code.py', 'ExampleScene'),
+    'scene/connect_four.BoardScene': ('connect_four.py', 'BoardScene'),
+}
+
+
+def primitive(*sizes):
+    def register(fn):
+        PRIMITIVES[fn.__name__] = (fn, sizes)
+        return fn
+    return register
+
+
+def example_source(lines: int) -> str:
+    source = []
+    while len(source) < lines:
+        i = len(source)
+        source += [
+            f'for i_{i} in range({i}, {i + 10}):',
+            f'    if i_{i} % 2 == 0:',
+            f'        total = total + i_{i} * {i}',
+            f'print("total", total)',
+        ]
+    return '\n'.join(source[:lines])
+
+
+@primitive(10, 100, 1000)
+def code_window(lines):
+    return CodeWindow(example_source(lines))
+
+
+@primitive(10, 100, 1000)
+def code_window_direct(lines):
+    return CodeWindow(example_source(lines), direct_glyphs=True)
+
+
+@primitive((1, 7), (6, 7), (10, 10), (20, 20))
+def list_table(size):
+    rows, columns = size
+    if rows == 1:
+        return List(['.'] * columns)
+    row_lists = [List(['.'] * columns) for _ in range(rows)]
+    return VGroup(*row_lists, List(row_lists, horizontal=False))
+
+
+@primitive(1, 10, 50)
+def variable_scope(variables):
+    scope = VariableScope()
+    for i in range(variables):
+        scope.create_variable(f'var_{i}', i * 7)
+    return scope
+
+
+@primitive(10, 100, 1000)
+def for_range(stop):
+    # Every element of the range, the way it was before RANGE_WINDOW
+    loop = ForRange(VariableBox('i', 0), code_value(f'range({stop})'), window=None)
+    loop._make_range_and_targets(0, stop, 1)
+    return loop.expanded_range
+
+
+@primitive(10, 100, 1000)
+def for_range_window(stop):
+    loop = ForRange(VariableBox('i', 0), code_value(f'range({stop})'))
+    loop._make_range_and_targets(0, stop, 1)
+    return loop.expanded_range
+
+
+def clear_caches():
+    clear_text_cache()
+    manim_ace.code._code_template.cache_clear()
+    manim_ace.code._listing_template.cache_clear()
+    manim_ace.code._glyph_template.cache_clear()
+    manim_ace.highlight.highlight.cache_clear()
+    manim_ace.code.source_index.cache_clear()
+    manim_ace.variables._divider_template.cache_clear()
+    gc.collect()
+
+
+def measure_primitive(build, size, repeat: int) -> dict:
+    times = []
+    for _ in range(repeat):
+        clear_caches()
+        start = time.perf_counter()
+        mobject = build(size)
+        times.append(time.perf_counter() - start)
+
+    # Memory is measured separately, tracemalloc slows everything down
+    clear_caches()
+    tracemalloc.start()
+    build(size)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    camera = Camera()
+    frame_times = []
+    for _ in range(repeat):
+        camera.reset()
+        start = time.perf_counter()
+        camera.capture_mobjects([mobject])
+        frame_times.append(time.perf_counter() - start)
+
+    return {
+        'seconds': min(times),
+        'peak_bytes': peak,
+        'frame_seconds': min(frame_times),
+        'family_size': len(mobject.get_family()),
+    }
+
+
+def measure_scene(module_file: str, scene_name: str, repeat: int) -> dict:
+    times = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as media_dir, \
+                tempconfig({'disable_caching': True, 'verbosity': 'WARNING'}):
+            start = time.perf_counter()
+            render_scene(REPO_ROOT / module_file, scene_name, media_dir, 'l')
+            times.append(time.perf_counter() - start)
+    return {'seconds': min(times)}
+
+
+def run(pattern=None, repeat=3, scenes=True) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as code_cache:
+        # Keep the highlighting cache cold as well
+        manim_ace.code.CODE_CACHE_DIR = Path(code_cache)
+        for name, (build, sizes) in PRIMITIVES.items():
+            for size in sizes:
+                label = 'x'.join(map(str, size)) if isinstance(size, tuple) else size
+                key = f'{name}[{label}]'
+                if pattern and pattern not in key:
+                    continue
+                results[key] = measure_primitive(build, size, repeat)
+                print(f'{key:32} {results[key]["seconds"] * 1000:10.1f} ms')
+    if scenes:
+        for key, (module_file, scene_name) in SCENES.items():
+            if pattern and pattern not in key:
+                continue
+            # Renders are slow, once is plenty
+            results[key] = measure_scene(module_file, scene_name, 1)
+            print(f'{key:32} {results[key]["seconds"] * 1000:10.1f} ms')
+    return results
+
+
+def regressions(results: dict, baseline: dict, threshold: float) -> [str]:
+    found = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        for metric in ('seconds', 'peak_bytes', 'frame_seconds'):
+            old, new = baseline[key].get(metric), result.get(metric)
+            if old and new and new > old * threshold:
+                found.append(f'{key} {metric}: {old:.4g} -> {new:.4g} ({new / old:.2f}x)')
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-k', dest='pattern', help='Only run benchmarks whose name contains this')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--no-scenes', action='store_true', help='Skip the full scene renders')
+    parser.add_argument('--baseline', type=Path, default=BASELINE)
+    parser.add_argument('--save', action='store_true', help='Store the results as the baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='How many times slower than the baseline counts as a regression')
+    args = parser.parse_args(argv)
+
+    results = run(args.pattern, args.repeat, not args.no_scenes)
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    found = regressions(results, baseline, args.threshold)
+    for regression in found:
+        print('REGRESSION', regression)
+
+    new = [key for key in results if key not in baseline]
+    if args.save or new:
+        baseline.update(results if args.save else {key: results[key] for key in new})
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True))
+        print(f'Baseline for {len(results) if args.save else len(new)} benchmarks '
+              f'written to {args.baseline}')
+    return 1 if found and not args.save else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
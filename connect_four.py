@@ -21,6 +21,17 @@ PLAYER_ONE_TOKEN = 'G'
 PLAYER_TWO_COLOR = IBM_BLUE_20
 PLAYER_TWO_TOKEN = 'B'
 
+# The order the scenes appear in the video. Render the whole thing with
+# python -m manim_ace.render connect_four.py
+SCENE_ORDER = [
+  'ConnectFourIntro',
+  'BoardScene',
+  'AddTokenScene',
+  'HorizontalWinnerScene',
+  'OtherDirectionScene',
+  'ConnectFourOutro',
+]
+
 
 # https://replit.com/@kjlubick/HarshTremendousScript#main.py
 first_scene_code = """
@@ -0,0 +1,150 @@
+from manim import *
+
+import hashlib
+
+from itertools import groupby
+
+from manim_ace.renderer import _feed_mobject, stroke_reach
+
+
+class LayerCamera(MovingCamera):
+    """A MovingCamera that keeps the pixels of the bottom layers of a scene.
+
+    Every play() starts by drawing whatever does not move into a static
+    frame, and in an AnimatedCodeScene that is mostly the same code window
+    and variables as in the play() before. With the scene's layers in
+    `layers`, the frame is kept after each of the layers it starts with,
+    whether it is given the layers or their members,
+    under a fingerprint of the layers so far and of the view. The next time
+    it starts with layers that have the same fingerprints, the kept frame
+    is copied in and only the layers after it are drawn.
+
+    Frames are only kept while the view stays put, and only when the layers
+    are drawn first, whole and in order, so the result is exactly what drawing
+    everything would give.
+
+    With `cull` set, VMobjects that are fully transparent or entirely out
+    of the frame are not drawn, though they stay in the scene.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.layers: [Mobject] = []
+        self.cull = False
+        # [(fingerprint of the view and the layers up to here, frame)]
+        self._layer_frames = []
+        self._last_view = None
+        self._fresh = False
+        # (x0, y0, x1, y1) in pixels. While set, nothing is drawn outside
+        # of it, see AceRenderer.render()
+        self.clip = None
+        super().__init__(*args, **kwargs)
+
+    def reset(self):
+        super().reset()
+        # Nothing drawn on top of the background yet
+        self._fresh = True
+        return self
+
+    def set_pixel_array(self, pixel_array, convert_from_floats=False):
+        super().set_pixel_array(pixel_array, convert_from_floats)
+        self._fresh = False
+
+    def get_cairo_context(self, pixel_array):
+        # Never cached by a MovingCamera, so the clip is only on this one
+        ctx = super().get_cairo_context(pixel_array)
+        if self.clip is not None:
+            x0, y0, x1, y1 = self.clip
+            matrix = ctx.get_matrix()
+            ctx.identity_matrix()
+            ctx.rectangle(x0, y0, x1 - x0, y1 - y0)
+            ctx.clip()
+            ctx.set_matrix(matrix)
+        return ctx
+
+    def get_mobjects_to_display(self, *args, **kwargs):
+        mobjects = super().get_mobjects_to_display(*args, **kwargs)
+        if not self.cull:
+            return mobjects
+        center = self.frame_center
+        frame_low = center - [self.frame_width / 2, self.frame_height / 2, 0]
+        frame_high = center + [self.frame_width / 2, self.frame_height / 2, 0]
+        return [mobj for mobj in mobjects if not self._culled(mobj, frame_low, frame_high)]
+
+    def _culled(self, mobj: Mobject, frame_low, frame_high) -> bool:
+        if not isinstance(mobj, VMobject) or len(mobj.points) == 0:
+            return False
+        stroke_width = mobj.get_stroke_width()
+        background_width = mobj.get_stroke_width(background=True)
+        if (not mobj.get_fill_opacities().any()
+                and (stroke_width == 0 or not mobj.get_stroke_opacities().any())
+                and (background_width == 0
+                     or not mobj.get_stroke_opacities(background=True).any())):
+            return True
+        reach = stroke_reach(self, max(stroke_width, background_width))
+        low = mobj.points.min(axis=0) - reach
+        high = mobj.points.max(axis=0) + reach
+        return (high[0] < frame_low[0] or low[0] > frame_high[0]
+                or high[1] < frame_low[1] or low[1] > frame_high[1])
+
+    def _view_fingerprint(self) -> bytes:
+        h = hashlib.blake2b(digest_size=20)
+        h.update(np.ascontiguousarray(self.frame.points).tobytes())
+        h.update(repr((self.pixel_width, self.pixel_height, str(self.background_color),
+                       self.background_opacity, id(self.background))).encode())
+        return h.digest()
+
+    def capture_mobjects(self, mobjects, **kwargs):
+        fresh, self._fresh = self._fresh, False
+        view = self._view_fingerprint()
+        if view != self._last_view:
+            moving = self._last_view is not None
+            self._last_view = view
+            self._layer_frames = []
+            if moving:
+                # Nothing kept would be of use
+                return super().capture_mobjects(mobjects, **kwargs)
+        if not fresh or not self.layers:
+            return super().capture_mobjects(mobjects, **kwargs)
+
+        # The static frame of a play() gets the members of the layers, not
+        # the layers themselves, so they are matched by what is drawn.
+        # Where each layer ends in display, as long as display starts with
+        # the layers, every one of them whole and right after the one before
+        display = self.get_mobjects_to_display(mobjects, **kwargs)
+        ends = []
+        end = 0
+        for layer in self.layers:
+            members = self.get_mobjects_to_display([layer], **kwargs)
+            if len(display) < end + len(members) or any(
+                    a is not b for a, b in zip(display[end:], members)):
+                break
+            end += len(members)
+            ends.append(end)
+        if not ends:
+            return self._draw(display)
+
+        fingerprints = []
+        h = hashlib.blake2b(view, digest_size=20)
+        for layer in self.layers[:len(ends)]:
+            _feed_mobject(h, layer)
+            fingerprints.append(h.copy().digest())
+
+        kept = 0
+        while (kept < len(ends) and kept < len(self._layer_frames)
+               and self._layer_frames[kept][0] == fingerprints[kept]):
+            kept += 1
+        start = 0
+        if kept:
+            self.pixel_array[:] = self._layer_frames[kept - 1][1]
+            start = ends[kept - 1]
+        del self._layer_frames[kept:]
+        for i in range(kept, len(ends)):
+            self._draw(display[start:ends[i]])
+            self._layer_frames.append((fingerprints[i], self.pixel_array.copy()))
+            start = ends[i]
+        self._draw(display[start:])
+
+    def _draw(self, display: [Mobject]):
+        """Camera.capture_mobjects() for what get_mobjects_to_display() returned."""
+        for group_type, group in groupby(display, self.type_or_raise):
+            self.display_funcs[group_type](list(group), self.pixel_array)
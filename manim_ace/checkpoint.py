@@ -0,0 +1,177 @@
+"""Lets a long render pick up where it died.
+
+With `use_checkpoints = True` on an AnimatedCodeScene (or MANIM_ACE_CHECKPOINT=1
+in the environment), every time a section is finished its partial movies
+are put aside in media_dir/manim_ace/checkpoints/<Scene>, together with a
+summary of the manim_ace state at that point (PC, call stack, variables,
+functions, layers).
+
+When the scene is rendered again, construct() cannot be entered halfway,
+so it runs from the top as usual, but the sections that were finished
+are skipped: only their end states are applied (see
+AnimatedCodeScene.skipping()), which takes a fraction of the time. At
+every one of their ends the state is compared with the one saved, and
+the saved movies take their place in the final video.
+
+Changing the scene's module, manim_ace itself, the resolution, the frame
+rate or the background starts over from scratch.
+"""
+from manim import *
+
+import hashlib
+import inspect
+import json
+import os
+import shutil
+
+from pathlib import Path
+from manim.scene.section import Section
+
+CHECKPOINT_ENV = 'MANIM_ACE_CHECKPOINT'
+CHECKPOINT_VERSION = 1
+
+
+class CheckpointMismatch(Exception):
+    pass
+
+
+def checkpoints_dir() -> Path:
+    return config.get_dir('media_dir') / 'manim_ace' / 'checkpoints'
+
+
+def _rounded(values) -> list:
+    return [round(float(v), 3) for v in values]
+
+
+def _value_summary(value) -> str:
+    if isinstance(value, Mobject):
+        return f'<{type(value).__name__}>'
+    return repr(value)
+
+
+def scene_state(scene) -> dict:
+    """A summary of the manim_ace state of scene, meant to be compared.
+
+    Only what matters to the viewer is in here (where things are, what the
+    variables hold), so it does not matter whether it was reached by
+    animating or by skipping.
+    """
+    state = {
+        'pc': list(scene.pc_loc),
+        'pc_stack': [list(loc) for _, loc in scene.pc_stack],
+        'variables': [],
+        'functions': len(scene.functions),
+        'layers': [len(layer) for layer in scene.layers],
+    }
+    if scene.pc is not None:
+        state['pc_box'] = _rounded([*scene.pc.get_center()[:2], scene.pc.width, scene.pc.height])
+    if scene.variables is not None:
+        for scope in scene.variables.scope_stack:
+            state['variables'].append({
+                box.name: _value_summary(box.value) for box in scope.variable_boxes.values()
+            })
+    return state
+
+
+def source_fingerprint(scene) -> str:
+    """Changes whenever the partial movies of scene could have."""
+    key = hashlib.sha256()
+    try:
+        key.update(Path(inspect.getfile(type(scene))).read_bytes())
+    except (OSError, TypeError):
+        key.update(type(scene).__qualname__.encode())
+    # How everything is laid out and animated
+    package = Path(__file__).resolve().parent
+    for path in sorted(package.rglob('*.py')):
+        key.update(str(path.relative_to(package)).encode())
+        key.update(path.read_bytes())
+    key.update(json.dumps([
+        CHECKPOINT_VERSION, config.pixel_width, config.pixel_height,
+        config.frame_rate, config.movie_file_extension,
+        config.frame_width, config.frame_height, str(config.background_color),
+        config.background_opacity, config.transparent,
+    ]).encode())
+    return key.hexdigest()
+
+
+class Checkpoint:
+    def __init__(self, scene, directory=None):
+        self.scene = scene
+        if directory is None:
+            directory = checkpoints_dir() / type(scene).__name__
+        self.directory = Path(directory)
+        self.manifest_path = self.directory / 'manifest.json'
+        self.fingerprint = source_fingerprint(scene)
+        # Sections finished by an earlier render, which this one skips
+        self.completed = self._load()
+        self.resumable = len(self.completed)
+        # (section, saved partial movies) for the sections that were skipped
+        self._restored: [(Section, [str])] = []
+
+    def _load(self) -> [dict]:
+        try:
+            manifest = json.loads(self.manifest_path.read_text())
+        except (OSError, ValueError):
+            return []
+        if manifest.get('fingerprint') != self.fingerprint:
+            logger.info("Scene changed since its checkpoint, rendering from the start")
+            return []
+        completed = []
+        for entry in manifest['sections']:
+            if not all(Path(f).exists() for f in entry['partial_movie_files']):
+                break
+            completed.append(entry)
+        if completed:
+            logger.info(f"Resuming after section {len(completed) - 1} "
+                        f"('{completed[-1]['name']}')")
+        return completed
+
+    def _save(self, sections: [dict]):
+        manifest = {'fingerprint': self.fingerprint, 'sections': sections}
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(manifest, indent=2))
+        os.replace(tmp_path, self.manifest_path)
+
+    def section_done(self, index: int, name: str, section: Section):
+        """Called when section number index (which is section) is over."""
+        state = scene_state(self.scene)
+        if index < self.resumable:
+            entry = self.completed[index]
+            if entry['state'] != state:
+                self.manifest_path.unlink(missing_ok=True)
+                raise CheckpointMismatch(
+                    f"Section {index} ('{name}') did not end the way it did when "
+                    f"it was checkpointed. The checkpoint was removed, render again.")
+            self._restored.append((section, entry['partial_movie_files']))
+            return
+
+        # Keep our own copies, the partial movie cache gets cleaned up and
+        # uncached renders reuse file names.
+        section_dir = self.directory / f'section_{index:03}'
+        shutil.rmtree(section_dir, ignore_errors=True)
+        section_dir.mkdir(parents=True)
+        files = []
+        for i, partial in enumerate(section.get_clean_partial_movie_files()):
+            saved = section_dir / f'{i:05}{Path(partial).suffix}'
+            try:
+                os.link(partial, saved)
+            except OSError:
+                shutil.copy2(partial, saved)
+            files.append(str(saved))
+        self.completed.append({
+            'name': name,
+            'partial_movie_files': files,
+            'state': state,
+        })
+        self._save(self.completed)
+
+    def restore_partial_movies(self):
+        """Puts the saved movies in place of the skipped sections'."""
+        file_writer = self.scene.renderer.file_writer
+        for section, files in self._restored:
+            section.partial_movie_files = list(files)
+        # The scene's list is what ends up in the movie
+        file_writer.partial_movie_files = [
+            f for section in file_writer.sections for f in section.partial_movie_files
+        ]
@@ -1,12 +1,22 @@
 from manim import *
+from manim import __version__ as MANIM_VERSION
 
+import ast
+import hashlib
+import io
+import json
+import os
 import re
+import tokenize
 
+from functools import lru_cache
+from pathlib import Path
 from typing import Optional
 
 from .colors import (BLACK_07, IBM_CYAN_20, IBM_RED_20, IBM_PURPLE_30,
                      USER_FUNCTION_COLOR, BLACK_12)
 from .fonts import ROBOTO_MONO
+from .highlight import CODE_STYLE, PALETTE_SWAP, default_color, highlight, indent
 
 FOR_SCOPE_COLOR = BLACK_07
 NESTED_SCOPE_COLOR = BLACK_12
@@ -15,14 +25,63 @@ ELSE_SCOPE_COLOR = IBM_RED_20
 ELIF_SCOPE_COLOR = IBM_PURPLE_30
 
 
+# What _code_template() gives Code, which build_listing() has to match
+CODE_FONT_SIZE = 24
+CODE_LINE_SPACING = 0.6
+CODE_LINE_NO_BUFF = 0.4
+# CodeWindow brings the line numbers this much closer to the code
+LINE_NO_GAP_TRIM = 0.1
+# and moves the ones Code lays out that end in 1 this much left
+LINE_NO_ONE_NUDGE = 0.04
+
+
+# Bump this whenever the contents of a cache entry change shape.
+CODE_CACHE_VERSION = 1
+# Where highlighted listings are kept between renders. None means a
+# directory inside manim's media_dir.
+CODE_CACHE_DIR: Optional[Path] = None
+
+
+def code_cache_dir() -> Path:
+    if CODE_CACHE_DIR is not None:
+        return Path(CODE_CACHE_DIR)
+    return config.get_dir("media_dir") / "manim_ace" / "code"
+
+
 class CodeWithPalette(Code):
+    """A Code whose highlighting is cached on disk, keyed on its contents."""
+
+    def _cache_key(self) -> str:
+        key = json.dumps([
+            CODE_CACHE_VERSION, MANIM_VERSION, self.code_string, self.tab_width,
+            self.indentation_chars, self.style, self.font, self.language,
+            self.insert_line_no, self.line_no_from,
+        ])
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def _cache_path(self) -> Path:
+        return code_cache_dir() / f"{self._cache_key()}.json"
+
+    def _gen_html_string(self):
+        try:
+            self._cached_entry = json.loads(self._cache_path().read_text())
+        except (OSError, ValueError):
+            self._cached_entry = None
+        if self._cached_entry is not None:
+            self.html_string = self._cached_entry['html_string']
+            return
+        super()._gen_html_string()
+        # _gen_code_json chops this up, so hold on to the original.
+        self._raw_html_string = self.html_string
+
     def _gen_code_json(self):
+        if self._cached_entry is not None:
+            self.default_color = self._cached_entry['default_color']
+            self.code_json = self._cached_entry['code_json']
+            self.tab_spaces = self._cached_entry['tab_spaces']
+            return
+
         super()._gen_code_json()
-        palette_swap = {
-            # purple used by if and for is just a little too light
-            # for me
-            '#A90D91': '#900A7F',
-        }
         # print("Before palette swap:", self.code_json)
         for line in self.code_json:
             for entry in line:
@@ -31,69 +90,445 @@ class CodeWithPalette(Code):
                 if '>' in color:
                     # Replace malformed colors with black
                     color = '#000000'
-                entry[1] = palette_swap.get(color, color)
+                entry[1] = PALETTE_SWAP.get(color, color)
         # print("After palette swap:", self.code_json)
+        self._save_cache_entry()
+
+    def _save_cache_entry(self):
+        path = self._cache_path()
+        entry = {
+            'html_string': self._raw_html_string,
+            'default_color': self.default_color,
+            'code_json': self.code_json,
+            'tab_spaces': self.tab_spaces,
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Several renders may share the cache, so never let anyone
+            # see a half written entry.
+            tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+            tmp_path.write_text(json.dumps(entry))
+            os.replace(tmp_path, path)
+        except OSError:
+            # The cache is only an optimization
+            pass
+
+
+@lru_cache(maxsize=32)
+def _code_template(source_code: str, tab_width: int, start_at_line: int) -> Code:
+    # Building the glyphs for a listing is slow; the same listing is often
+    # shown by several scenes (or several times in one), so keep the laid
+    # out version around and hand out copies.
+    return CodeWithPalette(
+        code=source_code,
+        # The default for rendered indentation is 3 (ick).
+        tab_width=tab_width,
+        # Indentation of this type will be converted to tabs before rendering.
+        # For convenience, align it to the rendered width so the input source
+        # code aligns with the rendered version.
+        indentation_chars=" " * tab_width,
+        line_spacing=CODE_LINE_SPACING,
+        background_stroke_width=1,
+        background_stroke_color=GREY,
+        insert_line_no=True,
+        style=CODE_STYLE,
+        background="rectangle",
+        language="python",
+        font=ROBOTO_MONO,
+        name="source_code",
+        line_no_from=start_at_line,
+    )
+
+
+@lru_cache(maxsize=8)
+def _font_metrics(font: str) -> (float, float):
+    """How far apart the characters and the lines of a listing are."""
+    grid = Paragraph('00', '00', font=font, font_size=CODE_FONT_SIZE,
+                     line_spacing=CODE_LINE_SPACING, disable_ligatures=True)
+    advance = grid[0][1].get_center()[0] - grid[0][0].get_center()[0]
+    pitch = grid[0][0].get_center()[1] - grid[1][0].get_center()[1]
+    return advance, pitch
+
+
+@lru_cache(maxsize=256)
+def _glyph_template(char: str, font: str) -> (VMobject, np.ndarray):
+    """The glyph of char, and how far its center is from that of a 0 in
+    the same place."""
+    advance, _ = _font_metrics(font)
+    pair = Text('0' + char, font=font, font_size=CODE_FONT_SIZE, disable_ligatures=True)
+    return pair[1], pair[1].get_center() - pair[0].get_center() - RIGHT * advance
+
+
+def _glyph(char: str, font: str, color: str, cell: np.ndarray) -> VMobject:
+    template, offset = _glyph_template(char, font)
+    glyph = template.copy().set_color(color)
+    return glyph.move_to(cell + offset)
+
+
+def build_listing(source_code: str, tab_width=4, start_at_line=1,
+                  font=ROBOTO_MONO, style=CODE_STYLE) -> VGroup:
+    """Lays out a highlighted listing the way CodeWithPalette does.
+
+    The font is monospaced, so every glyph goes straight to its line and
+    column. Like a Code, it returns (outline, line numbers, lines), except
+    the outline is empty and there are no Dots for the indentation: the
+    lines start at their first visible character. Other spaces are
+    VectorizedPoints. The line numbers are on the character grid as well,
+    as close to the code as CodeWindow has them.
+    """
+    return _lay_out_listing(highlight(source_code, tab_width, style), start_at_line,
+                            font, default_color(style))
+
+
+def _lay_out_listing(chars: ((str, str),), start_at_line=1, font=ROBOTO_MONO,
+                     label_color=None) -> VGroup:
+    """build_listing() for lines of (char, color) that are already highlighted."""
+    advance, pitch = _font_metrics(font)
+    if label_color is None:
+        label_color = default_color()
+
+    labels, lines = VGroup(), VGroup()
+    # The column of the last digits of the line numbers, where the right
+    # of a 0 is as far left of the first column as in a tidied Code
+    zero_width = _glyph_template('0', font)[0].width
+    last_digit = -advance / 2 - CODE_LINE_NO_BUFF + LINE_NO_GAP_TRIM - zero_width / 2
+    for row, line_chars in enumerate(chars):
+        start = DOWN * pitch * row
+        line = VGroup()
+        for column in range(indent(line_chars), len(line_chars)):
+            char, color = line_chars[column]
+            cell = start + RIGHT * advance * column
+            line.add(VectorizedPoint(cell) if char.isspace() else _glyph(char, font, color, cell))
+        lines.add(line)
+
+        number = str(start_at_line + row)
+        first_digit = last_digit - advance * (len(number) - 1)
+        labels.add(VGroup(*[_glyph(digit, font, label_color,
+                                   start + RIGHT * (first_digit + advance * i))
+                            for i, digit in enumerate(number)]))
+
+    listing = VGroup(VMobject(), labels, lines)
+    # Code centers itself
+    VGroup(labels, lines).move_to(ORIGIN)
+    return listing
+
+
+def _recolor(line: VGroup, line_chars: ((str, str),)):
+    """Colors the glyphs of a line, without its indentation, as line_chars say."""
+    line_chars = line_chars[indent(line_chars):]
+    # Tabs are not one glyph each, leave those lines alone
+    if len(line_chars) != len(line):
+        return
+    for glyph, (_, color) in zip(line, line_chars):
+        glyph.set_color(color)
+
+
+@lru_cache(maxsize=32)
+def _listing_template(source_code: str, tab_width: int, start_at_line: int) -> VGroup:
+    return build_listing(source_code, tab_width, start_at_line)
+
+
+class SourceIndex:
+    """Where the tokens and AST nodes of a listing are, in glyphs.
+
+    Glyph positions are what CodeWindow lines are indexed by: every
+    character (including spaces) is a glyph, except for the indentation,
+    which CodeWindow removes. Lines are numbered the way the listing shows
+    them.
+    """
+
+    def __init__(self, source_code: str, start_at_line=1):
+        # Pygments drops the leading newlines, so the first line shown
+        # is not necessarily the first line of the source.
+        leading = len(source_code) - len(source_code.lstrip('\n'))
+        self.line_offset = start_at_line - 1 - leading
+        self.source_lines = source_code.split('\n')
+        # line -> token text -> [(start, end), ...]
+        self.tokens = {}
+        for tok in _tokenize(source_code):
+            (start_line, start_col), (end_line, end_col) = tok.start, tok.end
+            if start_line != end_line or not tok.string.strip():
+                continue
+            line = start_line + self.line_offset
+            span = (self._glyph(start_line, start_col), self._glyph(start_line, end_col))
+            self.tokens.setdefault(line, {}).setdefault(tok.string, []).append(span)
+        try:
+            self.tree = ast.parse(source_code)
+        except SyntaxError:
+            # Listings are allowed to be snippets; only node() needs this.
+            self.tree = None
+
+    def _glyph(self, source_line: int, col: int) -> int:
+        text = self.source_lines[source_line - 1]
+        return col - (len(text) - len(text.lstrip()))
+
+    def token_span(self, line: int, text: str, occurrence=0) -> (int, int):
+        spans = self.tokens.get(line, {}).get(text, [])
+        assert occurrence < len(spans), f"No {text!r} #{occurrence} on line {line}"
+        return spans[occurrence]
+
+    def node_span(self, path: str) -> (int, int, int):
+        """Returns (line, start, end) of the AST node at path.
+
+        Paths are written like attribute access on the module node,
+        e.g. 'body[1].iter' or 'body[0].body[2].value.func'.
+        """
+        assert self.tree is not None, "Listing is not valid Python"
+        node = self.tree
+        for field, index in re.findall(r'(\w+)|\[(\d+)\]', path):
+            node = getattr(node, field) if field else node[int(index)]
+        assert node.lineno == node.end_lineno, f"{path} spans several lines"
+        text = self.source_lines[node.lineno - 1].encode()
+        # AST offsets count UTF-8 bytes, we want characters
+        start = len(text[:node.col_offset].decode())
+        end = len(text[:node.end_col_offset].decode())
+        return (node.lineno + self.line_offset, self._glyph(node.lineno, start),
+                self._glyph(node.lineno, end))
+
+
+def _tokenize(source_code: str):
+    try:
+        yield from tokenize.generate_tokens(io.StringIO(source_code).readline)
+    except (tokenize.TokenError, IndentationError, SyntaxError):
+        # Keep whatever was tokenized before the listing stopped making sense
+        return
+
+
+@lru_cache(maxsize=32)
+def source_index(source_code: str, start_at_line=1) -> SourceIndex:
+    return SourceIndex(source_code, start_at_line)
+
+
+# A CodeWindow with visible_lines builds its lines this many at a time
+CODE_PAGE_LINES = 20
+# Every page of a listing is highlighted between two of these lines, so
+# that all pages are laid out alike, whatever they start or end with.
+_PAGE_ANCHOR = '#'
+
+
+@lru_cache(maxsize=8)
+def _line_pitch(template, tab_width: int) -> float:
+    """How far apart the lines of a listing are."""
+    code = template(f'{_PAGE_ANCHOR}\n{_PAGE_ANCHOR}', tab_width, 1)
+    return code[2][0].get_top()[1] - code[2][1].get_top()[1]
+
+
+def _line_number(key) -> Optional[int]:
+    match = re.fullmatch(r'(?:line|label)_(\d+)', key) if isinstance(key, str) else None
+    return int(match.group(1)) if match else None
 
 
 class CodeWindow(VDict):
+    """A listing whose lines are line_<n> and their numbers label_<n>.
+
+    With visible_lines, only that many lines are shown at a time, starting
+    with top_line, and lines are only built (a page at a time) once they
+    are shown or looked up. scroll_to() brings other lines into view.
+
+    With direct_glyphs, the listing is laid out by build_listing() rather
+    than by manim's Code, which is much quicker.
+    """
+
+    visible_lines: Optional[int] = None
+
     def __init__(self, source_code: str, tab_width: int = 4,
-                 start_at_line=1):
+                 start_at_line=1, visible_lines: Optional[int] = None,
+                 direct_glyphs=False):
         super().__init__()
         self.line_offset = start_at_line - 1
-
-        code = CodeWithPalette(
-            code=source_code,
-            # The default for rendered indentation is 3 (ick).
-            tab_width=tab_width,
-            # Indentation of this type will be converted to tabs before rendering.
-            # For convenience, align it to the rendered width so the input source
-            # code aligns with the rendered version.
-            indentation_chars=" " * tab_width,
-            line_spacing=0.6,
-            background_stroke_width=1,
-            background_stroke_color=GREY,
-            insert_line_no=True,
-            style="xcode",
-            background="rectangle",
-            language="python",
-            font=ROBOTO_MONO,
-            name="source_code",
-            line_no_from=start_at_line,
-        )
+        self.source_code = source_code
         self.indent_chars = tab_width
+        self.visible_lines = visible_lines
+        self.direct_glyphs = direct_glyphs
+        self._template = _listing_template if direct_glyphs else _code_template
 
-        # Ignore outline (code[0])
-        for i in range(0, len(code[1])):
-            # Line numbers with 1 in the low digit are a bit
-            # wonky, alignment wise.
-            if (i + start_at_line) % 10 == 1:
-                code[1][i].shift(LEFT * 0.04)
-            # Reduce the gap between line and code a bit
-            code[1][i].shift(RIGHT * 0.1)
-
-            # Code turns leading tabs or spaces into invisible Dots.
-            # These Dots are not located properly either (as of v0.17.2)
-            # This is non-intuitive, so we remove them.
-            to_remove = []
-            for j in range(0, len(code[2][i])):
-                if type(code[2][i][j]) == Dot:
-                    to_remove.append(code[2][i][j])
-                else:
-                    break
-            code[2][i].remove(*to_remove)
+        if visible_lines is None:
+            code = self._template(source_code, tab_width, start_at_line).copy()
+            # Ignore outline (code[0])
+            for i in range(0, len(code[1])):
+                if not direct_glyphs:
+                    _tidy_line(code[1][i], code[2][i], i + start_at_line)
+                self.add([
+                    (f"label_{i + start_at_line}", code[1][i]),
+                    (f"line_{i + start_at_line}", code[2][i]),
+                ])
+            self.total_lines = len(code[1])
+            self.code_area = code[2]
+        else:
+            # Pygments drops the leading and trailing newlines
+            self._source_lines = source_code.strip('\n').split('\n')
+            self.total_lines = len(self._source_lines)
+            # Highlighted as a whole, so pages starting inside a string
+            # (say) are colored the same as when shown all at once
+            self._chars = highlight(source_code, tab_width)
+            self.top_line = start_at_line
+            # Pages built so far
+            self._pages = set()
+            # line -> (origin, line step) when its label and line were last
+            # placed, for the lines that are not shown and so do not move
+            # with the window.
+            self._detached = {}
+            self.code_area = VGroup()
+            self._build_page(0)
+            self.ensure_lines(self.top_line, self.top_line + visible_lines - 1)
+            self._show_lines()
 
-            self.add([
-                (f"label_{i + start_at_line}", code[1][i]),
-                (f"line_{i + start_at_line}", code[2][i]),
-            ])
-        self.total_lines = len(code[1])
         self.scopes = VGroup()
         # Insert it in front of the background behind everything else
         self.submobjects.insert(0, self.scopes)
-        self.code_area = code[2]
+
+    def __getitem__(self, key):
+        if self.visible_lines is not None:
+            line = _line_number(key)
+            if line is not None:
+                self.ensure_lines(line, line)
+                if line in self._detached:
+                    self._place_detached(line)
+        return super().__getitem__(key)
+
+    def __contains__(self, key):
+        line = _line_number(key) if self.visible_lines is not None else None
+        if line is not None:
+            # Whether or not it is built yet
+            return 0 < line - self.line_offset <= self.total_lines
+        return super().__contains__(key)
+
+    def _frame(self) -> (np.ndarray, np.ndarray):
+        """Where the (anchor) line before the first line starts, and how
+        far down each line starts from the one before."""
+        # Kept as points at the top of the view, which move with the window
+        # but not when it scrolls.
+        top, step = self._view()
+        return top - step * (self.top_line - self.line_offset), step
+
+    def content(self) -> [Mobject]:
+        """What moves when the window scrolls."""
+        view = [self.submob_dict['view_top'], self.submob_dict['view_next']]
+        return [mobj for mobj in self.submobjects if mobj not in view]
+
+    def ensure_lines(self, start: int, end: int):
+        """Builds the pages of lines start to end (inclusive) that are missing."""
+        first = self.line_offset + 1
+        start = max(start, first) - first
+        end = min(end, first + self.total_lines - 1) - first
+        for page in range(start // CODE_PAGE_LINES, end // CODE_PAGE_LINES + 1):
+            if page not in self._pages:
+                self._build_page(page)
+
+    def _build_page(self, page: int):
+        self._pages.add(page)
+        tab_width = self.indent_chars
+        pitch = _line_pitch(self._template, tab_width)
+        first = page * CODE_PAGE_LINES
+        page_lines = self._source_lines[first:first + CODE_PAGE_LINES]
+        page_chars = self._chars[first:first + CODE_PAGE_LINES]
+        first += self.line_offset + 1
+        page_source = '\n'.join([_PAGE_ANCHOR, *page_lines, _PAGE_ANCHOR])
+        if self.direct_glyphs:
+            anchor_chars = ((_PAGE_ANCHOR, default_color()),)
+            code = _lay_out_listing((anchor_chars, *page_chars, anchor_chars), first - 1)
+        else:
+            code = self._template(page_source, tab_width, first - 1).copy()
+        anchor, anchor_label = code[2][0], code[1][0]
+
+        if 'view_top' not in self.submob_dict:
+            # The first page stays where it was laid out, and places the rest
+            origin = anchor.get_corner(UL)
+            top = origin + DOWN * pitch * (self.top_line - self.line_offset)
+            self.add([
+                ('view_top', VectorizedPoint(top)),
+                ('view_next', VectorizedPoint(top + DOWN * pitch)),
+            ])
+            self._label_offset = anchor_label.get_corner(DR) - origin
+        origin, step = self._frame()
+        scale = np.linalg.norm(step) / pitch
+        placed = VGroup(*code[2][1:-1])
+        if self.direct_glyphs:
+            # The numbers are on the same grid as the lines
+            placed.add(*code[1][1:-1])
+        placed.scale(scale, about_point=anchor.get_corner(UL))
+        placed.shift(origin + step * (first - 1 - self.line_offset) - anchor.get_corner(UL))
+
+        if not self.direct_glyphs:
+            # How Code highlighted the page on its own
+            page_colors = highlight(page_source, tab_width)[1:-1]
+        for i, (label, line) in enumerate(zip(code[1][1:-1], code[2][1:-1])):
+            number = first + i
+            if not self.direct_glyphs:
+                # Pages are numbered separately, so place the numbers one by one
+                label.scale(scale)
+                label.move_to(origin + step * (number - self.line_offset) + self._label_offset * scale, DR)
+                _tidy_line(label, line, number)
+                if page_chars[i] != page_colors[i]:
+                    _recolor(line, page_chars[i])
+            self.submob_dict[f'label_{number}'] = label
+            self.submob_dict[f'line_{number}'] = line
+            self._detached[number] = (origin, step)
+
+    def _place_detached(self, line: int):
+        """Moves a line that is not shown to where the window has gone since."""
+        (old_origin, old_step), (origin, step) = self._detached[line], self._frame()
+        scale = np.linalg.norm(step) / np.linalg.norm(old_step)
+        for key in (f'label_{line}', f'line_{line}'):
+            self.submob_dict[key].scale(scale, about_point=old_origin).shift(origin - old_origin)
+        self._detached[line] = (origin, step)
+
+    def shown_lines(self) -> range:
+        first = self.line_offset + 1
+        if self.visible_lines is None:
+            return range(first, first + self.total_lines)
+        end = min(self.top_line + self.visible_lines, first + self.total_lines)
+        return range(self.top_line, end)
+
+    def _show_lines(self, shown=None) -> ([Mobject], [Mobject]):
+        """Adds the lines in view (or shown) to the window and takes out
+        the others. Returns what was added and what was taken out."""
+        if shown is None:
+            shown = self.shown_lines()
+        added, removed = [], []
+        for line in sorted(shown):
+            if line in self._detached:
+                self._place_detached(line)
+                del self._detached[line]
+                parts = [self[f'label_{line}'], self[f'line_{line}']]
+                self.submobjects += parts
+                self.code_area.add(parts[1])
+                added += parts
+        frame = self._frame()
+        for key in list(self.submob_dict):
+            line = _line_number(key)
+            if line is None or line in shown or line in self._detached:
+                continue
+            parts = [self.submob_dict[f'label_{line}'], self.submob_dict[f'line_{line}']]
+            self._take_out(parts)
+            self.code_area.remove(parts[1])
+            self._detached[line] = frame
+            removed += parts
+        return added, removed
+
+    def _take_out(self, mobjects: [Mobject]):
+        # VDict.remove() would forget the keys too
+        for mobj in mobjects:
+            if mobj in self.submobjects:
+                self.submobjects.remove(mobj)
+
+    def scroll_to(self, line: int, **kwargs) -> Optional[Animation]:
+        """Scrolls the window just enough for line to be shown.
+
+        Returns None if it already is (or the window shows every line).
+        """
+        if self.visible_lines is None or line in self.shown_lines():
+            return None
+        if line < self.top_line:
+            top_line = line
+        else:
+            top_line = line - self.visible_lines + 1
+        return CodeScroll(self, top_line, **kwargs)
 
     def line_width(self) -> float:
         """Returns the maximum width of a line of code."""
+        if self.visible_lines is not None:
+            return self.code_area.width
         return self.lines(1, self.total_lines).width
 
     def lines(self, start: int, end: Optional[int]):
@@ -105,9 +540,66 @@ class CodeWindow(VDict):
             vg.add(self[f"line_{i}"])
         return vg
 
+    def source_index(self) -> SourceIndex:
+        return source_index(self.source_code, self.line_offset + 1)
+
+    def token(self, line: int, text: str, occurrence=0) -> VGroup:
+        """Returns the glyphs of a token, e.g. token(3, 'range')."""
+        start, end = self.source_index().token_span(line, text, occurrence)
+        return self[f'line_{line}'][start:end]
+
+    def node(self, path: str) -> VGroup:
+        """Returns the glyphs of an AST node, e.g. node('body[1].iter')."""
+        line, start, end = self.source_index().node_span(path)
+        return self[f'line_{line}'][start:end]
+
+    def locate(self, line, start=0, end=None) -> (int, int, Optional[int]):
+        """Turns a location given by names into glyph offsets.
+
+        line can be an AST path (see SourceIndex.node_span), and start
+        can be a token on the line, optionally with end as the token
+        to stop at (inclusive). Anything else is passed through.
+        """
+        if isinstance(line, str):
+            return self.source_index().node_span(line)
+        if isinstance(start, str):
+            index = self.source_index()
+            start, token_end = index.token_span(line, start)
+            if isinstance(end, str):
+                token_end = index.token_span(line, end)[1]
+            elif end is not None:
+                token_end = end
+            end = token_end
+        return line, start, end
+
     def add_scope_rectangle(self, key: str, mobj: Mobject):
         self.submob_dict[key] = mobj
         self.scopes.add(mobj)
+        if self.visible_lines is not None:
+            # Where it is in lines, to cut it down to those in view
+            top, step = self._view()
+            for part in mobj.family_members_with_points():
+                part.scope_rows = self.top_line + (part.points[:, 1] - top[1]) / step[1]
+            self._clip_scopes()
+
+    def _view(self) -> (np.ndarray, np.ndarray):
+        """Where the top line in view starts, and how far down each line
+        starts from the one before."""
+        top = self.submob_dict['view_top'].get_center()
+        return top, self.submob_dict['view_next'].get_center() - top
+
+    def _clip_scopes(self, top_line: Optional[float] = None):
+        """Cuts the scope rectangles down to the lines in view, as if
+        top_line (which may be between two lines) was at the top."""
+        if top_line is None:
+            top_line = self.top_line
+        top, step = self._view()
+        for mobj in self.scopes.family_members_with_points():
+            rows = getattr(mobj, 'scope_rows', None)
+            if rows is None or len(rows) != len(mobj.points):
+                continue
+            rows = np.clip(rows, top_line, top_line + self.visible_lines)
+            mobj.points[:, 1] = top[1] + step[1] * (rows - top_line)
 
     def highlight_scope(self, scope_type: str, lines: int, indents: int,
                         line: int, start: int, end: int,
@@ -149,3 +641,79 @@ class CodeWindow(VDict):
         new_scope.set_opacity(0)
         self.add_scope_rectangle(f'scope_{line}', new_scope)
         return new_scope.animate.set_opacity(1.0)
+
+
+def _tidy_line(label: Mobject, line: VGroup, number: int):
+    """For the lines of a Code; build_listing() has none of this to tidy."""
+    # Line numbers with 1 in the low digit are a bit
+    # wonky, alignment wise.
+    if number % 10 == 1:
+        label.shift(LEFT * LINE_NO_ONE_NUDGE)
+    # Reduce the gap between line and code a bit
+    label.shift(RIGHT * LINE_NO_GAP_TRIM)
+
+    # Code turns leading tabs or spaces into invisible Dots.
+    # These Dots are not located properly either (as of v0.17.2)
+    # This is non-intuitive, so we remove them.
+    to_remove = []
+    for j in range(0, len(line)):
+        if type(line[j]) == Dot:
+            to_remove.append(line[j])
+        else:
+            break
+    line.remove(*to_remove)
+
+
+class CodeScroll(Animation):
+    """Scrolls a CodeWindow with visible_lines so that top_line comes first.
+
+    Lines coming into view fade in, the ones going out fade out. How far
+    everything moves is known as soon as it is created, see scroll_shift.
+    """
+
+    def __init__(self, code_window: CodeWindow, top_line: int, **kwargs):
+        first = code_window.line_offset + 1
+        top_line = max(first, min(top_line, first + code_window.total_lines - code_window.visible_lines))
+        self.top_line = top_line
+        _, step = code_window._frame()
+        self.scroll_shift = -step * (top_line - code_window.top_line)
+        super().__init__(code_window, **kwargs)
+
+    def create_starting_mobject(self) -> Mobject:
+        # Nothing but the shift is interpolated
+        return self.mobject
+
+    def begin(self):
+        code_window = self.mobject
+        old_lines = code_window.shown_lines()
+        new_lines = range(self.top_line, self.top_line + len(old_lines))
+        code_window.ensure_lines(new_lines.start, new_lines.stop - 1)
+        # Everything goes in where it is before scrolling. The lines going
+        # out stay in until the end.
+        self.fading_in, _ = code_window._show_lines(set(old_lines) | set(new_lines))
+        for mobj in self.fading_in:
+            mobj.set_opacity(0)
+        self.from_line = code_window.top_line
+        code_window.top_line = self.top_line
+        self.fading_out = [code_window[f'{kind}_{line}'] for line in old_lines
+                           if line not in new_lines for kind in ('label', 'line')]
+        self.moved = 0
+        super().begin()
+
+    def interpolate_mobject(self, alpha: float):
+        a = self.rate_func(alpha)
+        for mobj in self.mobject.content():
+            mobj.shift(self.scroll_shift * (a - self.moved))
+        self.moved = a
+        self.mobject._clip_scopes(interpolate(self.from_line, self.top_line, a))
+        for mobj in self.fading_in:
+            mobj.set_opacity(a)
+        for mobj in self.fading_out:
+            mobj.set_opacity(1 - a)
+
+    def finish(self):
+        super().finish()
+        self.mobject._show_lines()
+        self.mobject._clip_scopes()
+        for mobj in self.fading_out:
+            mobj.set_opacity(1)
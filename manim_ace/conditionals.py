@@ -2,6 +2,7 @@ from manim import *
 
 from manim_ace.colors import TRUE_BACKGROUND_COLOR, FALSE_BACKGROUND_COLOR
 from manim_ace.fonts import LM_MONO
+from manim_ace.glyphs import cached_text
 
 
 MAX_TEXT_HEIGHT = 0.5
@@ -14,10 +15,10 @@ class Condition(VDict):
                                                buff=0.02)
 
         if state:
-            result_txt = Text('True', color=BLACK, font_size=18, font=LM_MONO)
+            result_txt = cached_text('True', LM_MONO, 18)
             condition_color.set(fill_color=TRUE_BACKGROUND_COLOR)
         else:
-            result_txt = Text('False', color=BLACK, font_size=18, font=LM_MONO)
+            result_txt = cached_text('False', LM_MONO, 18)
             condition_color.set(fill_color=FALSE_BACKGROUND_COLOR)
         result_txt.scale_to_fit_height(min(condition_color.height - 0.1, MAX_TEXT_HEIGHT))
         result_txt.move_to(condition_color)
@@ -1,7 +1,79 @@
+import json
+import os
 import sys
 
+from typing import Optional
+
 LM_MONO = "Latin Modern Mono"
 if sys.platform == "win32":
     # Windows names this font differently for unknown reasons
     LM_MONO = "LM Mono 10"
-ROBOTO_MONO = "Noto Sans Mono"
\ No newline at end of file
+ROBOTO_MONO = "Noto Sans Mono"
+
+REQUIRED_FONTS = [LM_MONO, ROBOTO_MONO]
+
+# Point this at a file to remember the installed fonts between runs.
+# Asking Pango for every installed font is surprisingly slow.
+FONT_CACHE_ENV = "MANIM_ACE_FONT_CACHE"
+
+_installed_fonts: Optional[frozenset] = None
+_from_disk = False
+_verified = False
+
+
+def installed_fonts(refresh=False) -> frozenset:
+    """Returns the names of all installed fonts, enumerating them at most once."""
+    global _installed_fonts, _from_disk
+    if _installed_fonts is not None and not refresh:
+        return _installed_fonts
+
+    cache_path = os.environ.get(FONT_CACHE_ENV)
+    if cache_path and not refresh:
+        try:
+            with open(cache_path) as f:
+                _installed_fonts = frozenset(json.load(f))
+            _from_disk = True
+            return _installed_fonts
+        except (OSError, ValueError):
+            pass
+
+    import manimpango
+    _installed_fonts = frozenset(manimpango.list_fonts())
+    _from_disk = False
+    if cache_path:
+        try:
+            with open(cache_path, 'w') as f:
+                json.dump(sorted(_installed_fonts), f)
+        except OSError:
+            pass
+    return _installed_fonts
+
+
+def resolve_font(font: str, fallbacks=()) -> str:
+    """Returns the first of font and its fallbacks that is installed."""
+    for candidate in [font, *fallbacks]:
+        if candidate in installed_fonts():
+            return candidate
+    raise ValueError(f"None of {[font, *fallbacks]} are installed")
+
+
+def verify_fonts(quiet=False):
+    """Makes sure the fonts manim_ace uses are installed.
+
+    The check only happens once per process, no matter how many scenes
+    are rendered.
+    """
+    global _verified
+    if _verified:
+        return
+    fonts = installed_fonts()
+    missing = [font for font in REQUIRED_FONTS if font not in fonts]
+    if missing and _from_disk:
+        # The fonts may have been installed since the list was saved
+        fonts = installed_fonts(refresh=True)
+        missing = [font for font in REQUIRED_FONTS if font not in fonts]
+    if not quiet:
+        print(f"ROBOTO_MONO = '{ROBOTO_MONO}'")
+        print(f"ROBOTO_MONO in fonts: {ROBOTO_MONO in fonts}")
+    assert not missing, f"Missing fonts: {missing}"
+    _verified = True
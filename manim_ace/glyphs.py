@@ -0,0 +1,30 @@
+from manim import *
+
+from functools import lru_cache
+
+# Rendering a Text goes through Pango and an SVG round trip, which dominates
+# the time it takes to build most manim_ace mobjects. The same handful of
+# strings (variable names, small numbers, True/False, list cells) get
+# rendered over and over, so we keep a rendered template around and hand
+# out copies of it.
+TEXT_CACHE_SIZE = 1024
+
+
+def cached_text(text, font: str, font_size: float, color=BLACK,
+                replace_spaces=False) -> Text:
+    """Returns a fresh copy of a (cached) Text with the given style."""
+    return _text_template(str(text), font, font_size, color,
+                          replace_spaces).copy()
+
+
+def clear_text_cache():
+    _text_template.cache_clear()
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def _text_template(text: str, font: str, font_size: float, color,
+                   replace_spaces: bool) -> Text:
+    # Never hand this out directly; callers are free to mutate what they get.
+    if replace_spaces:
+        return TextWithSpaces(text, color=color, font_size=font_size, font=font)
+    return Text(text, color=color, font_size=font_size, font=font)
@@ -0,0 +1,55 @@
+"""The colors of the characters of a listing, as Pygments highlights them.
+
+Nothing here needs manim; code.py lays the characters out.
+"""
+from functools import lru_cache
+
+from pygments import lex
+from pygments.lexers import PythonLexer
+from pygments.styles import get_style_by_name
+from pygments.token import Token
+
+CODE_STYLE = "xcode"
+PALETTE_SWAP = {
+    # purple used by if and for is just a little too light
+    # for me
+    '#A90D91': '#900A7F',
+}
+
+
+def default_color(style=CODE_STYLE) -> str:
+    return '#' + (get_style_by_name(style).style_for_token(Token.Text)['color'] or '000000')
+
+
+@lru_cache(maxsize=32)
+def highlight(source_code: str, tab_width=4, style=CODE_STYLE) -> ((str, str),):
+    """The characters of every line of a listing, with their colors.
+
+    Tabs are expanded to tab_width columns, and like Code, the leading and
+    trailing empty lines are dropped.
+    """
+    token_style = get_style_by_name(style)
+    text_color = default_color(style)
+    # [(char, color)] per line
+    chars = [[]]
+    for token_type, value in lex(source_code, PythonLexer(tabsize=tab_width)):
+        color = token_style.style_for_token(token_type)['color']
+        color = '#' + color.upper() if color else text_color
+        color = PALETTE_SWAP.get(color, color)
+        for char in value:
+            if char == '\n':
+                chars.append([])
+            else:
+                chars[-1].append((char, color))
+    # The lexer ends the source with a newline
+    if not chars[-1]:
+        chars.pop()
+    return tuple(tuple(line_chars) for line_chars in chars)
+
+
+def indent(line_chars: ((str, str),)) -> int:
+    """How many characters of indentation a line of highlight() has.
+
+    CodeWindow lines have no glyphs for these.
+    """
+    return len(line_chars) - len(''.join(c for c, _ in line_chars).lstrip())
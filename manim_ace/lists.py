@@ -1,10 +1,16 @@
 from manim import *
 
 from manim_ace.fonts import LM_MONO
+from manim_ace.glyphs import cached_text
 
 _EMPTY = '<empty>'
 
 
+LIST_H_BUFF = 0.3
+LIST_V_BUFF = 0.2
+LIST_LINE_CONFIG = {'stroke_width': 2, "color": BLACK}
+
+
 class List(VDict):
     def __init__(self, initial_contents=[],
                  horizontal=True):
@@ -14,19 +20,12 @@ class List(VDict):
         self.horizontal = horizontal
 
         if len(initial_contents) == 0:
-            data = ['<empty>']
+            data = [_EMPTY]
             # I get paranoid about using an empty list
             # from the default parameters.
             self.contents = []
         else:
-            data = []
-            for item in initial_contents:
-                if isinstance(item, str):
-                    data.append('"' + item + '"')
-                elif isinstance(item, List):
-                    data.append('<list>')
-                else:
-                    data.append(str(item))
+            data = [cell_text(item) for item in initial_contents]
 
         if horizontal:
             two_d_data = [data]
@@ -38,14 +37,17 @@ class List(VDict):
             name_mobj = create_vertical_list(two_d_data)
 
         self.add(name_mobj.items())
-        last = len(initial_contents)
+        # The unscaled size of every cell. This is all we need to work out
+        # where everything goes when the list changes, without having to
+        # re-render every cell into a new Table.
+        self.cell_sizes = [(self[f'index_{i}'].width, self[f'index_{i}'].height)
+                           for i in range(len(data))]
         # For convenience, add div aliases
         if horizontal:
             self.zeroth_alias = (f'div_-1_0', 'left_line')
-            self.last_alias = (f'div_{last - 1}_{last}', 'right_line')
         else:
             self.zeroth_alias = ('div_-1_0', 'top_line')
-            self.last_alias = (f'div_{last - 1}_{last}', 'bottom_line')
+        self._update_last_alias()
 
         self['background_rect'].set_opacity(1.0)
 
@@ -56,42 +58,101 @@ class List(VDict):
             key = self.last_alias[1]
         return super().__getitem__(key)
 
+    def _update_last_alias(self):
+        last = len(self.contents)
+        if self.horizontal:
+            self.last_alias = (f'div_{last - 1}_{last}', 'right_line')
+        else:
+            self.last_alias = (f'div_{last - 1}_{last}', 'bottom_line')
+
+    def _current_scale(self) -> float:
+        """How much this list has been scaled since it was created."""
+        width, height, _, _ = list_layout(self.cell_sizes, self.horizontal)
+        if self.horizontal:
+            return self['left_line'].get_length() / height
+        return self['top_line'].get_length() / width
+
+    def _cell_center(self, index: int):
+        before = self[f'div_{index - 1}_{index}'].get_center()
+        after = self[f'div_{index}_{index + 1}'].get_center()
+        if self.horizontal:
+            return np.array([(before[0] + after[0]) / 2,
+                             (self['top_line'].get_y() + self['bottom_line'].get_y()) / 2,
+                             0])
+        return np.array([(self['left_line'].get_x() + self['right_line'].get_x()) / 2,
+                         (before[1] + after[1]) / 2,
+                         0])
+
     def animate_append(self, new_item, source=None,
                        new_scale=None, new_align=None):
         if not new_scale:
             new_scale = 1.0
         if not new_align:
             new_align = (self, UL)
-        new_list = List(self.contents + [new_item],
-                        horizontal=self.horizontal)
-        new_list.scale(new_scale).align_to(new_align[0], new_align[1])
-        resize_anims = []
-        for key in ['background_rect', 'top_line', 'bottom_line', 'left_line', 'right_line']:
-            resize_anims.append(Transform(self[key], new_list[key]))
 
+        new_index = len(self.contents)
+        new_cell = cell_fn(cell_text(new_item))
+        sizes = self.cell_sizes if new_index > 0 else []
+        sizes = sizes + [(new_cell.width, new_cell.height)]
+
+        # Work out where the new list would go, as if it were a freshly
+        # created List scaled by new_scale and aligned to new_align.
+        width, height, centers, dividers = list_layout(sizes, self.horizontal)
+        width, height = width * new_scale, height * new_scale
+        origin = _aligned_center(width, height, new_align[0], new_align[1])
+        centers = [origin + c * new_scale for c in centers]
+        dividers = [origin + d * new_scale for d in dividers]
+        half_w, half_h = RIGHT * width / 2, UP * height / 2
+
+        if self.horizontal:
+            outer_lines = {
+                'top_line': (origin - half_w + half_h, origin + half_w + half_h),
+                'bottom_line': (origin - half_w - half_h, origin + half_w - half_h),
+                'left_line': (dividers[0] + half_h, dividers[0] - half_h),
+                'right_line': (dividers[-1] + half_h, dividers[-1] - half_h),
+            }
+            inner_lines = [(d - half_h, d + half_h) for d in dividers[1:-1]]
+        else:
+            outer_lines = {
+                'top_line': (dividers[0] - half_w, dividers[0] + half_w),
+                'bottom_line': (dividers[-1] - half_w, dividers[-1] + half_w),
+                'left_line': (origin - half_w + half_h, origin - half_w - half_h),
+                'right_line': (origin + half_w + half_h, origin + half_w - half_h),
+            }
+            inner_lines = [(d - half_w, d + half_w) for d in dividers[1:-1]]
+
+        background = (self['background_rect'].copy()
+                      .stretch_to_fit_width(width)
+                      .stretch_to_fit_height(height)
+                      .move_to(origin))
+        resize_anims = [Transform(self['background_rect'], background)]
+        for key, (start, end) in outer_lines.items():
+            resize_anims.append(Transform(self[key], _line_target(self[key], start, end)))
+
+        item_scale = new_scale / self._current_scale()
+        target_item = new_cell.scale(new_scale).move_to(centers[new_index])
         copy_anims = []
-        if len(self.contents) == 0:
+        if new_index == 0:
             resize_anims.append(FadeOut(self['index_0'].copy()))
             if source is None:
-                self['index_0'].become(new_list['index_0']).set_opacity(0)
+                self['index_0'].become(target_item).set_opacity(0)
                 copy_anims.append(self['index_0'].animate.set_opacity(1.0))
             else:
                 self['index_0'].become(source)
-                copy_anims.append(Transform(self['index_0'], new_list['index_0']))
+                copy_anims.append(Transform(self['index_0'], target_item))
         else:
             # Relocate existing dividers and items
-            for i in range(1, len(self.contents)):
-                resize_anims.append(Transform(self[f'div_{i - 1}_{i}'],
-                                              new_list[f'div_{i - 1}_{i}']))
+            for i in range(1, new_index):
+                div = self[f'div_{i - 1}_{i}']
+                resize_anims.append(Transform(div, _line_target(div, *inner_lines[i - 1])))
 
-            # Relocate existing items
-            for i in range(0, len(self.contents)):
-                resize_anims.append(Transform(self[f'index_{i}'],
-                                              new_list[f'index_{i}']))
+            for i in range(0, new_index):
+                item = self[f'index_{i}']
+                resize_anims.append(Transform(item, item.copy().scale(item_scale)
+                                                         .move_to(centers[i])))
 
             # Create the new divider.
-            new_index = len(self.contents)
-            new_div = new_list[f'div_{new_index - 1}_{new_index}'].set_opacity(0)
+            new_div = Line(*inner_lines[-1], **LIST_LINE_CONFIG).set_opacity(0)
             self.add([(f'div_{new_index - 1}_{new_index}', new_div)])
             # This can look a bit strange on Vertical lists if the width
             # changes, but I don't feel like making a better custom Animation
@@ -99,8 +160,7 @@ class List(VDict):
             resize_anims.append(new_div.animate.set_opacity(1.0))
 
             # Create the new item
-            new_item_mobj = new_list[f'index_{new_index}']
-            target_item = new_item_mobj.copy()
+            new_item_mobj = target_item.copy()
             if source is None:
                 new_item_mobj.set_opacity(0)
             else:
@@ -109,19 +169,22 @@ class List(VDict):
             copy_anims.append(Transform(new_item_mobj, target_item))
 
         self.contents.append(new_item)
+        self.cell_sizes = sizes
+        self._update_last_alias()
         return resize_anims, copy_anims
 
     def animate_set(self, index: int, new_value, source: Mobject = None,
                     resize=False):
         assert len(self.contents) > 0, 'Should use append'
         assert not resize, 'Not implemented yet'
-        new_align = (self, UL)
         self.contents[index] = new_value
-        new_list = List(self.contents,
-                        horizontal=self.horizontal)
-        new_list.scale_to_fit_width(self.width).align_to(new_align[0], new_align[1])
 
-        target_mobj = new_list[f'index_{index}']
+        # Only the one cell changes, so there is no need to lay out the
+        # whole list again; center the new value in the existing cell.
+        target_mobj = cell_fn(cell_text(new_value))
+        self.cell_sizes[index] = (target_mobj.width, target_mobj.height)
+        target_mobj.scale(self._current_scale()).move_to(self._cell_center(index))
+
         old_item = self[f'index_{index}'].copy()
         if source:
             source_mobj = self[f'index_{index}']
@@ -152,9 +215,66 @@ class List(VDict):
         return back
 
 
+def cell_text(item) -> str:
+    if isinstance(item, str):
+        return '"' + item + '"'
+    elif isinstance(item, List):
+        return '<list>'
+    return str(item)
+
+
 def cell_fn(s, **kwargs):
     assert isinstance(s, str), s
-    return Text(s, font_size=18, font=LM_MONO).set_color(BLACK).scale(1.25)
+    return cached_text(s, LM_MONO, 18).scale(1.25)
+
+
+def list_layout(cell_sizes: [(float, float)], horizontal=True):
+    """Works out where the parts of a List go, the same way Table does.
+
+    Takes the unscaled (width, height) of every cell and returns the total
+    width and height of the list, the center of every cell and the position
+    of every divider (including the outer lines at either end). Positions
+    are relative to the center of the list.
+    """
+    widths = np.array([size[0] for size in cell_sizes])
+    heights = np.array([size[1] for size in cell_sizes])
+    if horizontal:
+        slots = widths + LIST_H_BUFF
+        width = slots.sum()
+        height = heights.max() + LIST_V_BUFF
+        edges = -width / 2 + np.concatenate([[0], np.cumsum(slots)])
+        dividers = [RIGHT * x for x in edges]
+        centers = [RIGHT * x for x in edges[:-1] + slots / 2]
+    else:
+        slots = heights + LIST_V_BUFF
+        width = widths.max() + LIST_H_BUFF
+        height = slots.sum()
+        edges = height / 2 - np.concatenate([[0], np.cumsum(slots)])
+        dividers = [UP * y for y in edges]
+        centers = [UP * y for y in edges[:-1] - slots / 2]
+    return width, height, centers, dividers
+
+
+def _aligned_center(width, height, mob_or_point, direction):
+    """Where a width x height box centered at the origin ends up after align_to."""
+    if isinstance(mob_or_point, Mobject):
+        point = mob_or_point.get_critical_point(direction)
+    else:
+        point = np.array(mob_or_point, dtype=float)
+    center = np.zeros(3)
+    half_size = np.array([width / 2, height / 2, 0])
+    for dim in range(2):
+        if direction[dim] != 0:
+            center[dim] = point[dim] - direction[dim] * half_size[dim]
+    return center
+
+
+def _line_target(line: Line, start, end) -> Line:
+    """A copy of line moved onto start/end, keeping its direction so a
+    Transform does not flip it over."""
+    if np.dot(line.get_end() - line.get_start(), end - start) < 0:
+        start, end = end, start
+    return line.copy().put_start_and_end_on(start, end)
 
 
 def create_horizontal_list(data):
@@ -162,11 +282,11 @@ def create_horizontal_list(data):
     assert len(data[0]) > 0, data
     data = Table(data,
                  include_outer_lines=True,
-                 line_config={'stroke_width': 2, "color": BLACK},
+                 line_config=LIST_LINE_CONFIG,
                  element_to_mobject=cell_fn,
                  include_background_rectangle=True,
                  background_rectangle_color=WHITE,
-                 h_buff=0.3, v_buff=0.2)
+                 h_buff=LIST_H_BUFF, v_buff=LIST_V_BUFF)
     name_mobj = {
         'background_rect': data[0],
         'top_line': data[2],
@@ -186,11 +306,11 @@ def create_vertical_list(data):
     assert len(data[0]) == 1, data
     data = Table(data,
                  include_outer_lines=True,
-                 line_config={'stroke_width': 2, "color": BLACK},
+                 line_config=LIST_LINE_CONFIG,
                  element_to_mobject=cell_fn,
                  include_background_rectangle=True,
                  background_rectangle_color=WHITE,
-                 h_buff=0.3, v_buff=0.2)
+                 h_buff=LIST_H_BUFF, v_buff=LIST_V_BUFF)
     name_mobj = {
         'background_rect': data[0],
         'top_line': data[2],
@@ -205,13 +325,18 @@ def create_vertical_list(data):
     return name_mobj
 
 
+POINTER_BUFF = 0.03
+# Where the 4 points of a straight cubic Bezier segment are along it
+_LINE_ALPHAS = np.linspace(0, 1, 4)
+
+
 # TODO This would probably be more convenient if it
 # also included the <list> or <dictionary> part also
 class Pointer(VDict):
     def __init__(self, start, end, tip_size=0.25, stroke_width=5):
         super().__init__()
         line = Line(start=start, end=end, stroke_width=stroke_width,
-                    stroke_color=BLACK, buff=0.03)
+                    stroke_color=BLACK, buff=POINTER_BUFF)
         tip = _ArrowTriangleTip(stroke_width=0, fill_opacity=1.0,
                                 length=tip_size, width=tip_size,
                                 stroke_color=BLACK, fill_color=BLACK)
@@ -224,29 +349,65 @@ class Pointer(VDict):
         self.add([('line', line), ('tip', tip)])
 
     def point_to(self, end) -> Animation:
-        new_pointer = Pointer(start=self.start,
-                              end=end,
-                              tip_size=self.tip_size,
-                              stroke_width=self.stroke_width)
-        self.end = end
-        return Transform(self, new_pointer)
+        return self.relocate(self.start, end)
 
     def point_from(self, start) -> Animation:
-        new_pointer = Pointer(start=start,
-                              end=self.end,
-                              tip_size=self.tip_size,
-                              stroke_width=self.stroke_width)
-        self.start = start
-        return Transform(self, new_pointer)
+        return self.relocate(start, self.end)
 
     def relocate(self, start, end) -> Animation:
-        new_pointer = Pointer(start=start,
-                              end=end,
-                              tip_size=self.tip_size,
-                              stroke_width=self.stroke_width)
+        anim = PointerMove(self, start, end)
         self.start = start
         self.end = end
-        return Transform(self, new_pointer)
+        return anim
+
+
+class PointerMove(Animation):
+    """Moves a Pointer to new start and end points.
+
+    Pointers get moved around a lot. Rather than building a whole new
+    Pointer to Transform into, this reshapes the existing line and tip:
+    the line is straight, so its points follow directly from its ends,
+    and the tip is just rotated and moved along with the end.
+    """
+
+    def __init__(self, pointer: Pointer, start, end, **kwargs):
+        self.to_ends = (np.array(start, dtype=float), np.array(end, dtype=float))
+        super().__init__(pointer, **kwargs)
+
+    def create_starting_mobject(self) -> Mobject:
+        # begin() keeps everything we need, there is no need for a copy
+        return self.mobject
+
+    def begin(self):
+        line, tip = self.mobject['line'], self.mobject['tip']
+        self.tip_length = np.linalg.norm(tip.tip_point - tip.base)
+        # The tip as it would be pointing right, with its point at the origin
+        self.tip_shape = (tip.points - tip.tip_point) @ rotation_about_z(-tip.tip_angle).T
+        # Start from where the pointer is now, it may have been moved along
+        # with something else since it was last pointed.
+        direction = normalize(tip.tip_point - line.points[0])
+        self.from_ends = (line.points[0] - direction * POINTER_BUFF,
+                          tip.tip_point + direction * POINTER_BUFF)
+        if len(line.points) != len(_LINE_ALPHAS):
+            # Transformed into something else earlier, make it a single segment again
+            line.set_points_as_corners([line.points[0], line.points[-1]])
+        super().begin()
+
+    def interpolate_mobject(self, alpha: float):
+        alpha = self.rate_func(alpha)
+        start = interpolate(self.from_ends[0], self.to_ends[0], alpha)
+        end = interpolate(self.from_ends[1], self.to_ends[1], alpha)
+        length = np.linalg.norm(end - start)
+        if length == 0:
+            return
+        direction = (end - start) / length
+        start = start + direction * POINTER_BUFF
+        end = end - direction * POINTER_BUFF
+        base = end - direction * self.tip_length
+
+        line, tip = self.mobject['line'], self.mobject['tip']
+        line.points[:] = start + np.outer(_LINE_ALPHAS, base - start)
+        tip.points[:] = self.tip_shape @ rotation_about_z(angle_of_vector(direction)).T + end
 
 
 # not exported from Manim proper, probably by mistake
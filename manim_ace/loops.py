@@ -8,13 +8,24 @@ from .functions import Function
 from .utils import surround
 from .variables import VariableBox, code_value
 
+# Ranges longer than this only show this many elements at once, with
+# ellipses for the rest, sliding along as the loop goes.
+RANGE_WINDOW = 10
+
+
 class ForRange:
-    def __init__(self, loop_var: VariableBox, range_code: VGroup):
+    def __init__(self, loop_var: VariableBox, range_code: VGroup,
+                 window: Optional[int] = RANGE_WINDOW):
         self.loop_var = loop_var
         self.range_code = range_code
+        self.window = window
         self.code_tracker = None
         self.expanded_range = None
-        self.range = []
+        self.range = range(0)
+        # Index of the first element in expanded_range, and where the
+        # glyphs of each element shown are
+        self.first_shown = 0
+        self.target_spans = []
         self.index = -1
 
 
@@ -110,30 +121,74 @@ class ForRange:
         )
 
     def _make_range_and_targets(self, start: int, stop: int, step: int):
-        self.range = list(range(start, stop, step))
-        range_txt = code_value(str(self.range))
-
-        targets = []
-        offset = 1
-        for i in range(0, len(self.range)):
-            new_len = len(str(self.range[i]))
-            target = range_txt[offset:offset+new_len]
-            # Make the spaces less wide. How much? The width of
-            # the opening square brace, which looks less wide than
-            # the space.
-            target.shift(LEFT * range_txt[0].width * i)
-            # Also move commas and closing square brace
-            range_txt[offset+new_len].shift(LEFT * range_txt[0].width * i)
-            targets.append(target)
-            offset += new_len
-            offset += 1 # and the comma
-        self.targets = targets
-        self.expanded_range = range_txt
-
+        self.range = range(start, stop, step)
+        self.first_shown = 0
+        self.expanded_range, self.target_spans = self._range_text(0)
+
+    def _range_text(self, first: int) -> (Text, [(int, int)]):
+        """Renders the part of the range starting at element first."""
+        last = len(self.range) if self.window is None else first + self.window
+        items = [str(i) for i in self.range[first:last]]
+        if first > 0:
+            items.insert(0, '...')
+        if last < len(self.range):
+            items.append('...')
+        # Text has no glyphs for spaces
+        range_txt = code_value('[' + ', '.join(items) + ']')
+
+        lengths = np.array([len(item) for item in items], dtype=int)
+        # Every item starts after the opening bracket or the previous comma
+        starts = 1 + np.concatenate([[0], np.cumsum(lengths + 1)[:-1]]).astype(int)
+        # Make the spaces less wide. How much? The width of the opening
+        # square brace, which looks less wide than the space. Every item
+        # moves along with the comma (or closing brace) after it.
+        item_of_glyph = np.repeat(np.arange(len(items)), lengths + 1)
+        shifts = np.zeros(len(range_txt))
+        shifts[1:1 + len(item_of_glyph)] = item_of_glyph * range_txt[0].width
+        for glyph, shift in zip(range_txt, shifts):
+            if shift:
+                glyph.points[:, 0] -= shift
+
+        lead = 1 if first > 0 else 0
+        shown = min(last, len(self.range)) - first
+        spans = [(int(starts[lead + i]), int(starts[lead + i] + lengths[lead + i]))
+                 for i in range(shown)]
+        return range_txt, spans
+
+    @property
+    def targets(self) -> [VGroup]:
+        return [self.target(i) for i in range(self.first_shown,
+                                              self.first_shown + len(self.target_spans))]
+
+    def target(self, index: int) -> VGroup:
+        """The glyphs of an element of the range, which has to be shown."""
+        start, end = self.target_spans[index - self.first_shown]
+        return self.expanded_range[start:end]
+
+    def _slide_to(self, scene: Scene, index: int):
+        """Shows a different part of the range, with element index
+        second (so the previous one is still there)."""
+        first = max(0, min(index - 1, len(self.range) - self.window))
+        old_range = self.expanded_range
+        self.first_shown = first
+        self.expanded_range, self.target_spans = self._range_text(first)
+        self.expanded_range.scale_to_fit_height(old_range.height).align_to(old_range, UL)
+        if scene.skipping():
+            scene.remove(old_range)
+            scene.add(self.expanded_range)
+            return
+        scene.play(FadeOut(old_range), FadeIn(self.expanded_range), run_time=0.5)
+        scene.remove(old_range)
 
     def go_next(self, scene: Scene, wait=0.1):
         self.index += 1
-        next_target = self.targets[self.index]
+        if not 0 <= self.index - self.first_shown < len(self.target_spans):
+            self._slide_to(scene, self.index)
+        next_target = self.target(self.index)
+        if scene.skipping():
+            self.loop_var.set_contents(self.range[self.index])
+            scene.play(surround(self.code_tracker, next_target))
+            return
         scene.play(surround(self.code_tracker, next_target))
         scene.wait(wait)
 
@@ -0,0 +1,99 @@
+from manim import *
+
+import weakref
+
+from typing import Optional
+
+# Stands in for the scene itself as the parent of top level mobjects
+_TOP = None
+
+
+class ParentIndex:
+    """Remembers which group each mobject in a scene is in.
+
+    Searching the whole scene for a mobject's parent gets slow once code
+    windows and boards with thousands of glyphs are on screen, so we keep
+    weak references from children to their parents instead.
+
+    Groups can be changed without the index hearing about it (VDict.add,
+    become, ...), so every answer is checked before it is used. If it turns
+    out to be stale, we fall back to searching the scene, remembering the
+    parent of everything we pass on the way.
+    """
+
+    def __init__(self, scene: Scene):
+        self.scene = scene
+        self._parents = weakref.WeakKeyDictionary()
+
+    def index(self, *mobjects: Mobject, parent: Optional[Mobject] = _TOP):
+        """Records that mobjects (and everything below them) are in parent."""
+        ref = parent if parent is _TOP else weakref.ref(parent)
+        for mobj in mobjects:
+            self._parents[mobj] = ref
+            for member in mobj.get_family():
+                member_ref = weakref.ref(member)
+                for child in member.submobjects:
+                    self._parents[child] = member_ref
+
+    def forget(self, mobj: Mobject):
+        self._parents.pop(mobj, None)
+
+    def _siblings(self, ref) -> Optional[list]:
+        if ref is _TOP:
+            return self.scene.mobjects
+        parent = ref()
+        return None if parent is None else parent.submobjects
+
+    def parent(self, mobj: Mobject) -> Optional[Mobject]:
+        """Returns the group mobj is in, or None if it is at the top level.
+
+        Raises a KeyError if mobj is not in the scene at all.
+        """
+        ref = self._parents.get(mobj, False)
+        if ref is False or not _contains(self._siblings(ref), mobj):
+            ref = self._search(mobj)
+            if ref is False:
+                raise KeyError(mobj)
+        return None if ref is _TOP else ref()
+
+    def layer_of(self, mobj: Mobject) -> Optional[int]:
+        """Returns the index of the scene layer mobj is in, if any."""
+        layers = {id(layer): i for i, layer in enumerate(self.scene.layers)}
+        while mobj is not None:
+            if id(mobj) in layers:
+                return layers[id(mobj)]
+            mobj = self.parent(mobj)
+        return None
+
+    def remove(self, mobj: Mobject) -> bool:
+        """Removes mobj from whichever group it is in, without breaking up any groups."""
+        try:
+            parent = self.parent(mobj)
+        except KeyError:
+            return False
+        siblings = self.scene.mobjects if parent is None else parent.submobjects
+        siblings.remove(mobj)
+        self.forget(mobj)
+        return True
+
+    def _search(self, target: Mobject):
+        """Depth first search for target, indexing everything on the way.
+
+        Returns a reference to its parent, or False if it was not found.
+        """
+        stack = [(_TOP, list(reversed(self.scene.mobjects)))]
+        while stack:
+            ref, children = stack.pop()
+            while children:
+                child = children.pop()
+                self._parents[child] = ref
+                if child is target:
+                    return ref
+                if child.submobjects:
+                    stack.append((ref, children))
+                    ref, children = weakref.ref(child), list(reversed(child.submobjects))
+        return False
+
+
+def _contains(mobjects: Optional[list], mobj: Mobject) -> bool:
+    return mobjects is not None and any(m is mobj for m in mobjects)
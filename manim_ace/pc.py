@@ -0,0 +1,116 @@
+from manim import *
+
+from typing import Optional
+
+from manim_ace.colors import IBM_RED_60
+
+PC_COLOR = IBM_RED_60
+
+# How far a control point of a cubic Bezier quarter circle is from its anchor
+_KAPPA = 4 * (np.sqrt(2) - 1) / 3
+
+
+def _outline(half_width, half_height, radius):
+    """The Bezier points of a rounded rectangle centered at the origin.
+
+    Goes counterclockwise from the right end of the top edge, in 4 edges
+    and 4 quarter circles of 4 points each, like a RoundedRectangle.
+    """
+    w, h, r, k = half_width, half_height, radius, _KAPPA * radius
+    corners = [
+        # (end of the edge before the corner, start of the edge after it,
+        #  direction the edge before goes in, direction of the edge after it)
+        ((-w + r, h), (-w, h - r), (-1, 0), (0, -1)),
+        ((-w, -h + r), (-w + r, -h), (0, -1), (1, 0)),
+        ((w - r, -h), (w, -h + r), (1, 0), (0, 1)),
+        ((w, h - r), (w - r, h), (0, 1), (-1, 0)),
+    ]
+    points = []
+    edge_start = np.array([w - r, h])
+    for edge_end, arc_end, before, after in corners:
+        edge_end, arc_end = np.array(edge_end), np.array(arc_end)
+        points += [edge_start, (2 * edge_start + edge_end) / 3,
+                   (edge_start + 2 * edge_end) / 3, edge_end]
+        points += [edge_end, edge_end + k * np.array(before),
+                   arc_end - k * np.array(after), arc_end]
+        edge_start = arc_end
+    points = np.array(points)
+    return np.hstack([points, np.zeros((len(points), 1))])
+
+
+# The outline is linear in (half width, half height, radius), so any
+# outline is a weighted sum of these three.
+_OUTLINE_BASIS = np.array([_outline(1, 0, 0), _outline(0, 1, 0), _outline(0, 0, 1)])
+
+
+class ProgramCounter(VMobject):
+    """The rounded rectangle showing which code is being run.
+
+    It moves more than anything else in a scene, so instead of being rebuilt
+    around every new target (and transformed into that), it always has the
+    same points, which are recomputed from its bounds in place. See PCMove.
+    """
+
+    def __init__(self, target: Optional[Mobject] = None, buff=0.07,
+                 corner_radius=0.1, color=PC_COLOR, name="Program Counter",
+                 **kwargs):
+        super().__init__(color=color, name=name, **kwargs)
+        self.buff = buff
+        self.corner_radius = corner_radius
+        self.radius = corner_radius
+        if target is not None:
+            self.set_bounds(*self.bounds_around(target))
+
+    def bounds_around(self, target: Mobject, offset=ORIGIN) -> (np.ndarray, float, float, float):
+        """The (center, width, height, corner radius) that would surround target."""
+        return (target.get_center() + offset,
+                target.width + 2 * self.buff,
+                target.height + 2 * self.buff,
+                self.corner_radius)
+
+    def bounds(self) -> (np.ndarray, float, float, float):
+        return self.get_center(), self.width, self.height, self.radius
+
+    def set_bounds(self, center, width: float, height: float, radius: float):
+        radius = max(0, min(radius, width / 2, height / 2))
+        self.radius = radius
+        if self.points.shape != _OUTLINE_BASIS.shape[1:]:
+            self.points = np.zeros(_OUTLINE_BASIS.shape[1:])
+        self.points[:] = np.tensordot((width / 2, height / 2, radius), _OUTLINE_BASIS, 1) + center
+        return self
+
+
+class PCMove(Animation):
+    """Moves a ProgramCounter around target, or to the given bounds.
+
+    Only the bounds (center, size and corner radius) are interpolated. The
+    target is measured when the animation starts, not when it is created.
+    """
+
+    def __init__(self, pc: ProgramCounter, target: Optional[Mobject] = None,
+                 bounds=None, offset=ORIGIN, **kwargs):
+        assert (target is None) != (bounds is None)
+        self.target = target
+        self.to_bounds = bounds
+        self.offset = offset
+        super().__init__(pc, **kwargs)
+
+    def create_starting_mobject(self) -> Mobject:
+        # The bounds are all we need from the start, see begin()
+        return self.mobject
+
+    def begin(self):
+        pc = self.mobject
+        center, width, height, radius = pc.bounds()
+        self.from_bounds = np.array([*center, width, height, radius])
+        if self.target is not None:
+            center, width, height, radius = pc.bounds_around(self.target, self.offset)
+        else:
+            center, width, height, radius = self.to_bounds
+        self.to_bounds = np.array([*center, width, height, radius])
+        super().begin()
+
+    def interpolate_mobject(self, alpha: float):
+        alpha = self.rate_func(alpha)
+        bounds = interpolate(self.from_bounds, self.to_bounds, alpha)
+        self.mobject.set_bounds(bounds[:3], *bounds[3:])
@@ -0,0 +1,187 @@
+"""Finds out where the time of a render goes.
+
+Set `profile = True` on an AnimatedCodeScene (or MANIM_ACE_PROFILE=1 in the
+environment) and every play(), wait(), add() and remove() call, every
+manim_ace mobject that gets built, and the interpolation, drawing and
+encoding of every frame are timed. Once the movie is written, two reports
+end up next to it in media_dir/manim_ace/profiles:
+
+    <Scene>.json    every call with its section, wall time, the number of
+                    mobjects in the scene and the family size of what it
+                    worked on, plus totals per section
+    <Scene>.folded  time per call stack, in microseconds, in the folded
+                    format flamegraph.pl and speedscope read
+"""
+from manim import *
+
+import functools
+import json
+import time
+
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+from manim_ace.code import CodeWindow
+from manim_ace.conditionals import Condition
+from manim_ace.functions import Function
+from manim_ace.lists import List, Pointer
+from manim_ace.loops import ForRange
+from manim_ace.variables import VariableArea, VariableBox, VariableScope
+
+PROFILE_ENV = 'MANIM_ACE_PROFILE'
+
+# Building these is what most of our construction time goes into
+PROFILED_CLASSES = [CodeWindow, Condition, Function, List, Pointer, ForRange,
+                    VariableArea, VariableBox, VariableScope]
+
+# The profiler of the scene being rendered, if any. Constructors are wrapped
+# once per process, and only report to it while it is set.
+_active = None
+
+
+def profiles_dir() -> Path:
+    return config.get_dir('media_dir') / 'manim_ace' / 'profiles'
+
+
+def family_size(*mobjects) -> int:
+    return sum(len(m.get_family()) for m in mobjects if isinstance(m, Mobject))
+
+
+class Profiler:
+    def __init__(self, scene: Scene):
+        self.scene = scene
+        self.calls = []
+        # Folded call stack -> time spent in it, not counting its callees
+        self.folded = defaultdict(float)
+        # [name, time spent in callees] for the calls in progress
+        self._stack = []
+
+    def section(self) -> str:
+        log = getattr(self.scene, 'section_log', None)
+        return log[-1][0] if log else 'autocreated'
+
+    @contextmanager
+    def measure(self, name: str, mobjects=(), record=True):
+        """Times the body. Calls made per frame should pass record=False,
+        they only show up in the folded stacks and the section totals."""
+        self._stack.append([name, 0.0])
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            _, in_callees = self._stack.pop()
+            stack = ';'.join([self.scene.__class__.__name__, self.section()] +
+                             [frame[0] for frame in self._stack] + [name])
+            self.folded[stack] += elapsed - in_callees
+            if self._stack:
+                self._stack[-1][1] += elapsed
+            if record:
+                self.calls.append({
+                    'name': name,
+                    'section': self.section(),
+                    'seconds': elapsed,
+                    'mobjects': len(self.scene.mobjects),
+                    'family_size': family_size(*mobjects),
+                })
+
+    def wrap(self, obj, method: str, name=None, mobjects=None, record=True):
+        """Replaces obj.method with a version that is timed."""
+        original = getattr(obj, method)
+        name = name or method
+
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            with self.measure(name, mobjects(*args) if mobjects else (), record):
+                return original(*args, **kwargs)
+        setattr(obj, method, timed)
+
+    def install(self):
+        global _active
+        scene = self.scene
+        renderer = scene.renderer
+
+        def animated(*args):
+            return [anim.mobject for anim in args if isinstance(anim, Animation)]
+
+        self.wrap(scene, 'play', mobjects=animated)
+        self.wrap(scene, 'wait')
+        self.wrap(scene, 'add', mobjects=lambda *args: args)
+        self.wrap(scene, 'remove', mobjects=lambda *args: args)
+        self.wrap(scene, 'update_to_time', 'interpolate', record=False)
+        self.wrap(renderer, 'update_frame', 'draw', record=False)
+        self.wrap(renderer.file_writer, 'write_frame', 'encode', record=False)
+        self.wrap(renderer, 'scene_finished', 'finish movie')
+
+        finished = renderer.scene_finished
+
+        def scene_finished(*args, **kwargs):
+            try:
+                finished(*args, **kwargs)
+            finally:
+                self.uninstall()
+                self.write()
+        renderer.scene_finished = scene_finished
+
+        for cls in PROFILED_CLASSES:
+            _wrap_constructor(cls)
+        _active = self
+
+    def uninstall(self):
+        global _active
+        if _active is self:
+            _active = None
+
+    def report(self) -> dict:
+        sections = {}
+        for call in self.calls:
+            section = sections.setdefault(call['section'], {})
+            totals = section.setdefault(call['name'], {
+                'count': 0, 'seconds': 0.0, 'max_family_size': 0,
+            })
+            totals['count'] += 1
+            totals['seconds'] += call['seconds']
+            totals['max_family_size'] = max(totals['max_family_size'], call['family_size'])
+        # Per frame work is not in calls, so add it from the stacks
+        for stack, seconds in self.folded.items():
+            _, section, *frames = stack.split(';')
+            if frames[-1] in ('interpolate', 'draw', 'encode'):
+                totals = sections.setdefault(section, {}).setdefault(
+                    f'per frame: {frames[-1]}', {'seconds': 0.0})
+                totals['seconds'] += seconds
+        return {
+            'scene': self.scene.__class__.__name__,
+            'sections': sections,
+            'calls': self.calls,
+        }
+
+    def write(self, directory=None) -> Path:
+        directory = Path(directory) if directory is not None else profiles_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        base = directory / self.scene.__class__.__name__
+        json_path = base.with_suffix('.json')
+        json_path.write_text(json.dumps(self.report(), indent=2))
+        with open(base.with_suffix('.folded'), 'w') as f:
+            for stack, seconds in self.folded.items():
+                f.write(f'{stack} {round(seconds * 1e6)}\n')
+        logger.info(f"Profile written to {json_path}")
+        return json_path
+
+
+def _wrap_constructor(cls):
+    if getattr(cls.__init__, '_profiled', False):
+        return
+    original = cls.__init__
+
+    @functools.wraps(original)
+    def __init__(self, *args, **kwargs):
+        if _active is None:
+            return original(self, *args, **kwargs)
+        with _active.measure(f'{type(self).__name__}()'):
+            original(self, *args, **kwargs)
+        # Recorded after the fact, as the family only exists now
+        if _active.calls and isinstance(self, Mobject):
+            _active.calls[-1]['family_size'] = family_size(self)
+    __init__._profiled = True
+    cls.__init__ = __init__
@@ -0,0 +1,234 @@
+"""Renders a whole tutorial module (an "episode") into a single video.
+
+Every AnimatedCodeScene in the module is rendered in its own process with
+its own media directory, then the videos are joined in order. The order is
+taken from a SCENE_ORDER list of class names in the module if there is one,
+otherwise the order the scenes are defined in.
+
+Long scenes can also be split up by their sections (see next_section()).
+Each section is rendered by a separate process, which replays the scene
+with every other section skipped, and the sections are joined in order.
+
+    python -m manim_ace.render connect_four.py -q l -o connect_four.mp4
+    python -m manim_ace.render function_introduction.py --by-section
+
+With --stream the scenes are rendered one after the other in this process
+instead, straight into the episode's video (see manim_ace.streaming).
+"""
+from manim import *
+
+import argparse
+import importlib.util
+import inspect
+import multiprocessing
+import subprocess
+import sys
+import tempfile
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from manim_ace.camera import LayerCamera
+from manim_ace.renderer import AceRenderer
+from manim_ace.scene import AnimatedCodeScene
+from manim_ace.streaming import StreamEncoder
+
+QUALITY_FLAGS = {q['flag']: name for name, q in QUALITIES.items() if q['flag']}
+
+
+def load_module(module_path):
+    module_path = Path(module_path).resolve()
+    # Scenes usually import their neighbours (and manim_ace) relative to
+    # their own directory.
+    if str(module_path.parent) not in sys.path:
+        sys.path.insert(0, str(module_path.parent))
+    spec = importlib.util.spec_from_file_location(module_path.stem, module_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def discover_scenes(module) -> [type]:
+    """Returns the AnimatedCodeScenes defined in module, in episode order."""
+    scenes = [obj for obj in vars(module).values()
+              if inspect.isclass(obj) and issubclass(obj, AnimatedCodeScene)
+              and obj.__module__ == module.__name__]
+    order = getattr(module, 'SCENE_ORDER', None)
+    if order is None:
+        return scenes
+    by_name = {scene.__name__: scene for scene in scenes}
+    missing = [name for name in order if name not in by_name]
+    assert not missing, f"SCENE_ORDER names unknown scenes: {missing}"
+    return [by_name[name] for name in order]
+
+
+def configure(media_dir, quality: str, module_path=None):
+    """Points manim's (process wide) config at media_dir."""
+    config.media_dir = str(media_dir)
+    config.quality = QUALITY_FLAGS.get(quality, quality)
+    config.write_to_movie = True
+    if module_path is not None:
+        config.input_file = str(module_path)
+
+
+def render_scene(module_path, scene_name: str, media_dir, quality: str,
+                 section: Optional[int] = None) -> str:
+    """Renders one scene (or one section of it) and returns the path of its video.
+
+    Meant to be run in a worker process, as it changes manim's config.
+    """
+    module = load_module(module_path)
+    configure(media_dir, quality, module_path)
+    scene = getattr(module, scene_name)()
+    scene.render_section = section
+    scene.render()
+    return str(scene.renderer.file_writer.movie_file_path)
+
+
+def plan_sections(module_path, scene_name: str) -> [int]:
+    """Returns the sections of a scene that have animations to render.
+
+    This runs construct() with every section skipped and nothing written,
+    so it is much cheaper than a render.
+    """
+    module = load_module(module_path)
+    with tempconfig({'dry_run': True}):
+        scene = getattr(module, scene_name)()
+        # No section will ever have this index, so all of them are skipped
+        scene.render_section = sys.maxsize
+        scene.render()
+
+    log = scene.section_log
+    sections = []
+    for i, (name, skip_animations, first_play) in enumerate(log):
+        last_play = log[i + 1][2] if i + 1 < len(log) else scene.renderer.num_plays
+        if last_play > first_play and not skip_animations:
+            sections.append(i)
+    return sections
+
+
+def concat_movies(movie_files: [str], output_file) -> Path:
+    """Joins videos with identical encoding settings without re-encoding."""
+    output_file = Path(output_file)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+        for movie in movie_files:
+            f.write(f"file '{Path(movie).resolve().as_posix()}'\n")
+        list_file = f.name
+    try:
+        subprocess.run([
+            config.ffmpeg_executable,
+            '-y',
+            '-f', 'concat',
+            '-safe', '0',
+            '-i', list_file,
+            '-c', 'copy',
+            '-loglevel', config.ffmpeg_loglevel.lower(),
+            str(output_file),
+        ], check=True)
+    finally:
+        Path(list_file).unlink()
+    return output_file
+
+
+def render_module(module_path, output_file=None, scene_names: Optional[list[str]] = None,
+                  quality='l', processes: Optional[int] = None,
+                  work_dir=None, by_section=False) -> Path:
+    """Renders the scenes of a module in parallel and joins them into one video.
+
+    With by_section, every section of every scene is rendered separately.
+    """
+    module_path = Path(module_path).resolve()
+    if scene_names is None:
+        scene_names = [scene.__name__ for scene in discover_scenes(load_module(module_path))]
+    if work_dir is None:
+        work_dir = Path(config.media_dir) / 'manim_ace' / 'episodes' / module_path.stem
+    work_dir = Path(work_dir)
+    if output_file is None:
+        output_file = Path(config.media_dir) / 'videos' / f'{module_path.stem}.mp4'
+
+    # Every scene gets its own media dir so the workers never fight over
+    # partial movie files, and each keeps its cache between runs.
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=processes, mp_context=context) as pool:
+        if by_section:
+            plans = [pool.submit(plan_sections, module_path, name) for name in scene_names]
+            futures = []
+            for name, plan in zip(scene_names, plans):
+                for section in plan.result():
+                    media_dir = work_dir / name / f'section_{section:03}'
+                    futures.append(pool.submit(render_scene, module_path, name,
+                                               media_dir, quality, section))
+        else:
+            futures = [pool.submit(render_scene, module_path, name, work_dir / name, quality)
+                       for name in scene_names]
+        movie_files = [future.result() for future in futures]
+
+    return concat_movies(movie_files, output_file)
+
+
+def stream_module(module_path, output_file=None, scene_names: Optional[list[str]] = None,
+                  quality='l', work_dir=None, chapters=True) -> Path:
+    """Renders the scenes of a module one after the other into one video.
+
+    The frames of all the scenes go through a single ffmpeg process, so no
+    partial movie files are written and nothing has to be joined, but the
+    scenes are not rendered in parallel and no play is cached.
+    """
+    module_path = Path(module_path).resolve()
+    module = load_module(module_path)
+    if scene_names is None:
+        scenes = discover_scenes(module)
+    else:
+        scenes = [getattr(module, name) for name in scene_names]
+    if work_dir is None:
+        work_dir = Path(config.media_dir) / 'manim_ace' / 'episodes' / module_path.stem
+    if output_file is None:
+        output_file = Path(config.media_dir) / 'videos' / f'{module_path.stem}.mp4'
+
+    with tempconfig({}):
+        configure(work_dir, quality, module_path)
+        config.disable_caching = True
+        with StreamEncoder(output_file, chapters) as encoder:
+            for scene_class in scenes:
+                # A scene without a play() turns write_to_movie off for
+                # good, see CairoRenderer.scene_finished()
+                with tempconfig({}):
+                    renderer = AceRenderer(file_writer_class=encoder.file_writer_class(),
+                                           camera_class=LayerCamera)
+                    scene_class(renderer=renderer).render()
+    return Path(output_file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('module', help='Python file containing the scenes')
+    parser.add_argument('scenes', nargs='*',
+                        help='Scenes to render, in order (default: all of them)')
+    parser.add_argument('-o', '--output', help='Where to write the joined video')
+    parser.add_argument('-q', '--quality', default='l',
+                        help='One of ' + ', '.join(QUALITY_FLAGS))
+    parser.add_argument('-j', '--processes', type=int, default=None,
+                        help='Number of scenes to render at once')
+    parser.add_argument('--by-section', action='store_true',
+                        help='Render each section of each scene in its own process')
+    parser.add_argument('--stream', action='store_true',
+                        help='Render the scenes one by one straight into the video, '
+                             'without partial movie files')
+    parser.add_argument('--no-chapters', action='store_true',
+                        help='With --stream, do not write the chapters file')
+    args = parser.parse_args(argv)
+    if args.stream:
+        assert not args.by_section, "--stream renders whole scenes"
+        output = stream_module(args.module, args.output, args.scenes or None,
+                               quality=args.quality, chapters=not args.no_chapters)
+    else:
+        output = render_module(args.module, args.output, args.scenes or None,
+                               quality=args.quality, processes=args.processes,
+                               by_section=args.by_section)
+    print(f"Episode written to {output}")
+
+
+if __name__ == '__main__':
+    main()
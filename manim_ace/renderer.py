@@ -0,0 +1,293 @@
+from manim import *
+from manim import __version__ as MANIM_VERSION
+
+import hashlib
+import types
+
+from typing import Optional
+
+# Bump this whenever play_hash() changes what it looks at.
+PLAY_HASH_VERSION = 1
+
+# Style that ends up in the frame, besides the points
+_DRAWN_ATTRS = ['fill_rgbas', 'stroke_rgbas', 'background_stroke_rgbas',
+                'stroke_width', 'background_stroke_width', 'sheen_factor',
+                'sheen_direction', 'z_index', 'pixel_array']
+
+# Above this share of the frame, redrawing only what changed is not worth it
+DIRTY_RECT_MAX_AREA = 0.5
+
+# Animations keep references to other animations, rate functions and so on;
+# nothing this deep has ever mattered for what gets drawn.
+_MAX_DEPTH = 8
+
+
+class AceRenderer(CairoRenderer):
+    """The renderer AnimatedCodeScenes use.
+
+    For animations that are skipped (skipped sections, -n, ...) the plain
+    CairoRenderer still draws a frame of the static mobjects and one of the
+    end of the animation, only to throw them away. Here skipped animations
+    only bring the mobjects to their end state.
+
+    Partial movies are cached by play_hash() rather than by manim's hash,
+    so they only depend on the play() itself and on what is on screen when
+    it starts, see play_hash().
+
+    With a camera that can be clipped (see LayerCamera), each frame of an
+    animation only redraws the rectangle that the moving mobjects were or
+    are in, see render().
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (static image, view, moving mobjects, their pixel bounds) of the
+        # frame in the camera, when render() drew it
+        self._last_frame = None
+
+    def skipping(self) -> bool:
+        """True if the next play() will be skipped rather than rendered."""
+        self.skip_animations = self._original_skipping_status
+        self.update_skipping_status()
+        return self.skip_animations
+
+    def play(self, scene, *args, **kwargs):
+        if self.skipping():
+            self._apply(scene, None, *args, **kwargs)
+            return
+
+        if config.disable_caching:
+            return super().play(scene, *args, **kwargs)
+
+        scene.compile_animation_data(*args, **kwargs)
+        hash_current_animation = play_hash(scene, self.camera)
+        if self.file_writer.is_already_cached(hash_current_animation):
+            logger.info(
+                f"Animation {self.num_plays} : Using cached data (hash : %(hash_current_animation)s)",
+                {"hash_current_animation": hash_current_animation},
+            )
+            self.skip_animations = True
+            self._apply(scene, hash_current_animation)
+            return
+
+        self.file_writer.add_partial_movie_file(hash_current_animation)
+        self.animations_hashes.append(hash_current_animation)
+
+        self.file_writer.begin_animation(True)
+        scene.begin_animations()
+        # Save a static image, to avoid rendering non moving objects.
+        self.save_static_frame_data(scene, scene.static_mobjects)
+        if scene.is_current_animation_frozen_frame():
+            self.update_frame(scene, mobjects=scene.moving_mobjects)
+            self.freeze_current_frame(scene.duration)
+        else:
+            scene.play_internal()
+        self.file_writer.end_animation(True)
+
+        self.num_plays += 1
+
+    def update_frame(self, scene=None, mobjects=None, *args, dirty=None, **kwargs):
+        """With dirty, (x0, y0, x1, y1) in pixels, only that rectangle of the
+        frame is drawn again, over the static image."""
+        self._last_frame = None
+        if dirty is None:
+            return super().update_frame(scene, mobjects, *args, **kwargs)
+        camera = self.camera
+        x0, y0, x1, y1 = dirty
+        camera.pixel_array[y0:y1, x0:x1] = self.static_image[y0:y1, x0:x1]
+        camera.clip = dirty
+        try:
+            camera.capture_mobjects(mobjects)
+        finally:
+            camera.clip = None
+
+    def render(self, scene, time, moving_mobjects):
+        """Draws a frame of the animations being played.
+
+        If the frame before was drawn here too, over the same static image
+        and with the same view, only the moving mobjects can have changed.
+        Then the static image is put back and the moving mobjects are
+        redrawn inside the rectangle around where they were and where they
+        are now, and nowhere else. Outside of it nothing changed.
+        """
+        camera = self.camera
+        state = None
+        if self.static_image is not None and hasattr(camera, 'clip'):
+            display = camera.get_mobjects_to_display(moving_mobjects)
+            bounds = pixel_bounds(camera, display)
+            if bounds is not None:
+                view = repr((camera.frame_center, camera.frame_width, camera.frame_height))
+                state = (self.static_image, view, [id(m) for m in display], bounds)
+
+        last = self._last_frame
+        if (state is not None and last is not None and last[0] is state[0]
+                and last[1:3] == state[1:3]):
+            x0, y0 = np.minimum(last[3][:2], bounds[:2])
+            x1, y1 = np.maximum(last[3][2:], bounds[2:])
+            dirty = (x1 - x0) * (y1 - y0)
+        else:
+            dirty = None
+        if dirty is not None and dirty <= DIRTY_RECT_MAX_AREA * camera.pixel_width * camera.pixel_height:
+            self.update_frame(scene, moving_mobjects, dirty=(x0, y0, x1, y1))
+        else:
+            self.update_frame(scene, moving_mobjects)
+        self._last_frame = state
+        self.add_frame(self.get_frame())
+
+    def _apply(self, scene, partial_movie, *args, **kwargs):
+        """Plays the animations without rendering them.
+
+        partial_movie is the hash of the movie that stands in for them, or
+        None if they are skipped. With args, the animations still have to
+        be compiled.
+        """
+        if args:
+            scene.animations = scene.compile_animations(*args, **kwargs)
+            scene.add_mobjects_from_animations(scene.animations)
+            scene.duration = scene.get_run_time(scene.animations)
+        scene.stop_condition = None
+        self.time += scene.duration
+        # Keeps the section's list of partial movies in step with the plays
+        self.file_writer.add_partial_movie_file(partial_movie)
+        self.animations_hashes.append(partial_movie)
+
+        for animation in scene.animations:
+            animation._setup_scene(scene)
+            animation.begin()
+        scene.last_t = 0
+        scene.update_to_time(scene.duration)
+        for animation in scene.animations:
+            animation.finish()
+            animation.clean_up_from_scene(scene)
+        self.static_image = None
+
+        self.num_plays += 1
+
+
+def stroke_reach(camera, stroke_width: float) -> float:
+    """How far outside its points a stroke of stroke_width can be drawn."""
+    # Miter joins reach up to 10 half line widths out, Cairo's default limit
+    return 5 * stroke_width * camera.cairo_line_width_multiple
+
+
+def pixel_bounds(camera, mobjects: [Mobject]) -> Optional[np.ndarray]:
+    """The (x0, y0, x1, y1) pixels that drawing mobjects can change.
+
+    None unless they are all VMobjects, anything else is not drawn by Cairo.
+    """
+    low, high = np.full(3, np.inf), np.full(3, -np.inf)
+    stroke_width = 0
+    for mobj in mobjects:
+        if not isinstance(mobj, VMobject):
+            return None
+        if len(mobj.points) == 0:
+            continue
+        # Curves stay inside the hull of their control points
+        low = np.minimum(low, mobj.points.min(axis=0))
+        high = np.maximum(high, mobj.points.max(axis=0))
+        stroke_width = max(stroke_width, mobj.get_stroke_width(),
+                           mobj.get_stroke_width(background=True))
+    if low[0] > high[0]:
+        return np.zeros(4, dtype=int)
+
+    scale_x = camera.pixel_width / camera.frame_width
+    scale_y = camera.pixel_height / camera.frame_height
+    center = camera.frame_center
+    # Plus a pixel for antialiasing either way
+    pad = stroke_reach(camera, stroke_width) * max(scale_x, scale_y) + 2
+    x0 = (low[0] - center[0]) * scale_x + camera.pixel_width / 2 - pad
+    x1 = (high[0] - center[0]) * scale_x + camera.pixel_width / 2 + pad
+    y0 = camera.pixel_height / 2 - (high[1] - center[1]) * scale_y - pad
+    y1 = camera.pixel_height / 2 - (low[1] - center[1]) * scale_y + pad
+    return np.array([
+        np.clip(np.floor(x0), 0, camera.pixel_width),
+        np.clip(np.floor(y0), 0, camera.pixel_height),
+        np.clip(np.ceil(x1), 0, camera.pixel_width),
+        np.clip(np.ceil(y1), 0, camera.pixel_height),
+    ], dtype=int)
+
+
+def play_hash(scene, camera) -> str:
+    """Identifies the movie of the animations about to be played.
+
+    It covers the camera, the animations themselves (their mobjects, targets,
+    run times, rate functions, ...) and every mobject in the scene, as that
+    is all that ends up in the frames. Unlike manim's hash, nothing depends
+    on how the scene got here, or on the order mobjects were created in.
+    """
+    h = hashlib.blake2b(digest_size=20)
+    h.update(f'{PLAY_HASH_VERSION} {MANIM_VERSION}'.encode())
+    _feed(h, [camera.pixel_width, camera.pixel_height, camera.frame_rate,
+              camera.frame_width, camera.frame_height, camera.frame_center,
+              str(camera.background_color), camera.background_opacity], set(), 0)
+    for animation in scene.animations:
+        _feed(h, animation, set(), 0)
+    h.update(b'scene')
+    for mobj in scene.mobjects:
+        _feed_mobject(h, mobj)
+    return f'ace_{h.hexdigest()}'
+
+
+def _feed_mobject(h, mobj: Mobject):
+    for member in mobj.get_family():
+        h.update(type(member).__name__.encode())
+        h.update(np.ascontiguousarray(member.points).tobytes())
+        for attr in _DRAWN_ATTRS:
+            value = getattr(member, attr, None)
+            if value is not None:
+                h.update(attr.encode())
+                h.update(np.ascontiguousarray(value).tobytes()
+                         if isinstance(value, np.ndarray) else repr(value).encode())
+
+
+def _feed(h, obj, seen: set, depth: int):
+    if depth > _MAX_DEPTH:
+        return
+    if obj is None or isinstance(obj, (bool, int, float, str, bytes)):
+        h.update(repr(obj).encode())
+    elif isinstance(obj, np.ndarray):
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, Mobject):
+        if id(obj) in seen:
+            return
+        seen.add(id(obj))
+        _feed_mobject(h, obj)
+    elif isinstance(obj, (Scene, Camera, CairoRenderer)):
+        # Covered by play_hash() itself
+        h.update(type(obj).__qualname__.encode())
+    elif isinstance(obj, (list, tuple)):
+        h.update(type(obj).__name__.encode())
+        for item in obj:
+            _feed(h, item, seen, depth + 1)
+    elif isinstance(obj, (set, frozenset)):
+        # Iteration order changes between runs
+        h.update(repr(sorted(repr(item) for item in obj)).encode())
+    elif isinstance(obj, dict):
+        for key, value in obj.items():
+            _feed(h, key, seen, depth + 1)
+            _feed(h, value, seen, depth + 1)
+    elif isinstance(obj, types.MethodType):
+        _feed(h, obj.__func__, seen, depth + 1)
+        _feed(h, obj.__self__, seen, depth + 1)
+    elif isinstance(obj, types.FunctionType):
+        # Rate functions, path functions, ... are identified by their code
+        # and whatever they closed over.
+        code = obj.__code__
+        h.update(obj.__qualname__.encode())
+        h.update(code.co_code)
+        _feed(h, [c for c in code.co_consts if not isinstance(c, types.CodeType)],
+              seen, depth + 1)
+        for cell in obj.__closure__ or ():
+            try:
+                _feed(h, cell.cell_contents, seen, depth + 1)
+            except ValueError:
+                # Not filled in yet
+                pass
+    else:
+        h.update(type(obj).__qualname__.encode())
+        if id(obj) in seen:
+            return
+        seen.add(id(obj))
+        attrs = getattr(obj, '__dict__', None)
+        if attrs is not None:
+            _feed(h, attrs, seen, depth + 1)
@@ -1,30 +1,68 @@
 from manim import *
+from manim.scene.section import DefaultSectionType
+from manim.utils.exceptions import EndSceneEarlyException
 import numpy as np
-
-import manimpango
+import os
 
 from typing import Optional
 
-from manim_ace.fonts import LM_MONO, ROBOTO_MONO
-from manim_ace.colors import (IBM_RED_60, BLACK_07, IBM_CYAN_20, IBM_RED_20, IBM_CYAN_60,
+from manim_ace.camera import LayerCamera
+from manim_ace.checkpoint import CHECKPOINT_ENV, Checkpoint
+from manim_ace.fonts import verify_fonts
+from manim_ace.colors import (BLACK_07, IBM_CYAN_20, IBM_RED_20, IBM_CYAN_60,
                      STANDARD_FUNCTION_COLOR, LIBRARY_FUNCTION_COLOR,
                      SECONDARY_RECT_COLOR)
 from manim_ace.code import CodeWindow
 from manim_ace.lists import Pointer
-from manim_ace.utils import surround
+from manim_ace.parents import ParentIndex
+from manim_ace.pc import PC_COLOR, PCMove, ProgramCounter
+from manim_ace.profiling import PROFILE_ENV, Profiler
+from manim_ace.renderer import AceRenderer
+from manim_ace.streaming import StreamingFileWriter
+from manim_ace.utils import Applied, surround
 from manim_ace.variables import VariableArea, VariableBox, code_value
 from manim_ace.functions import Function
 
-PC_COLOR = IBM_RED_60
-
 TRUE_BACKGROUND_COLOR = IBM_CYAN_20
 FALSE_BACKGROUND_COLOR = IBM_RED_20
 
 
 class AnimatedCodeScene(MovingCameraScene):
+    # Set to True to stop setup() from printing which fonts it found
+    quiet_fonts = False
+    # When set, only this section is rendered and the scene stops once it
+    # is over. Every scene starts in section 0; each next_section() call
+    # starts the next one. See manim_ace.render.
+    render_section: Optional[int] = None
+    # Set to True (or set MANIM_ACE_PROFILE=1) to time the render, see
+    # manim_ace.profiling
+    profile = False
+    # Set to True (or set MANIM_ACE_CHECKPOINT=1) to be able to resume a
+    # render after its last finished section, see manim_ace.checkpoint
+    use_checkpoints = False
+    # Set to False to draw every layer of every frame, instead of reusing
+    # the pixels of layers that did not change, see manim_ace.camera
+    cache_layers = True
+    # Set to False to draw mobjects that are invisible or out of the frame
+    # anyway, see LayerCamera
+    cull_hidden = True
+
+    def __init__(self, renderer=None, camera_class=LayerCamera,
+                 skip_animations=False, **kwargs):
+        if renderer is None:
+            renderer = AceRenderer(camera_class=camera_class,
+                                   skip_animations=skip_animations)
+        super().__init__(renderer=renderer, camera_class=camera_class,
+                         skip_animations=skip_animations, **kwargs)
+
     # It is not recommended to override the __init__ method in user Scenes.
     # For code that should be ran before a Scene is rendered, use Scene.setup() instead
     def setup(self):
+        self.profiler = None
+        if self.profile or os.environ.get(PROFILE_ENV):
+            self.profiler = Profiler(self)
+            self.profiler.install()
+
         self.pc = None
         self.pc_loc = (-1, 0, 0)
         self.pc_stack = []
@@ -38,27 +76,84 @@ class AnimatedCodeScene(MovingCameraScene):
             Group(name="Layer 2"),
             Group(name="Layer 3 (pc)"),
         ]
-
-        fonts = manimpango.list_fonts()
-        print(f"ROBOTO_MONO = '{ROBOTO_MONO}'")
-        print(f"ROBOTO_MONO in fonts: {ROBOTO_MONO in fonts}")
-        # print(fonts)
-        assert (LM_MONO in fonts)
-        assert (ROBOTO_MONO in fonts)
+        self.parents = ParentIndex(self)
+        if self.cache_layers and isinstance(self.camera, LayerCamera):
+            self.camera.layers = self.layers
+        if isinstance(self.camera, LayerCamera):
+            self.camera.cull = self.cull_hidden
+
+        verify_fonts(quiet=self.quiet_fonts)
+
+        self.checkpoint = None
+        if ((self.use_checkpoints or os.environ.get(CHECKPOINT_ENV))
+                and self.render_section is None
+                and config.write_to_movie and not config.dry_run
+                # Streamed frames are gone once they are encoded
+                and not isinstance(self.renderer.file_writer, StreamingFileWriter)):
+            self.checkpoint = Checkpoint(self)
+
+        # (name, skip_animations, number of plays before it) for each section
+        self.section_log = [('autocreated', False, 0)]
+        if self.render_section not in (None, 0) or self._resuming(0):
+            # This replaces the empty section the file writer starts with
+            super().next_section('autocreated', skip_animations=True)
+
+    def _resuming(self, section: int) -> bool:
+        return self.checkpoint is not None and section < self.checkpoint.resumable
+
+    def _section_done(self):
+        if self.checkpoint is not None:
+            index = len(self.section_log) - 1
+            self.checkpoint.section_done(index, self.section_log[-1][0],
+                                         self.renderer.file_writer.sections[-1])
+
+    def next_section(self, name: str = "unnamed",
+                     type: str = DefaultSectionType.NORMAL,
+                     skip_animations: bool = False):
+        self._section_done()
+        self.section_log.append((name, skip_animations, self.renderer.num_plays))
+        index = len(self.section_log) - 1
+        if self.render_section is not None:
+            if index > self.render_section:
+                # Everything we were asked for has been rendered
+                raise EndSceneEarlyException()
+            skip_animations = skip_animations or index != self.render_section
+        skip_animations = skip_animations or self._resuming(index)
+        super().next_section(name, type, skip_animations)
+
+    def tear_down(self):
+        super().tear_down()
+        if self.checkpoint is not None:
+            self._section_done()
+            self.checkpoint.restore_partial_movies()
 
     def construct(self):
         self.camera.background_color = WHITE
         self.mobjects += self.layers
+        self.parents.index(*self.layers)
         # Make sure these are in the background
         self.add(self.functions, layer=0)
 
     def add(self, *mobjects, layer=0):
         """Adds the given mobject(s) to the specified layer."""
         self.layers[layer].add(*mobjects)
+        self.parents.index(*mobjects, parent=self.layers[layer])
 
     def remove(self, *mobjects):
         for mobj in mobjects:
-            remove_without_degrouping(self.mobjects, mobj)
+            self.parents.remove(mobj)
+
+    def layer_of(self, mobj: Mobject) -> Optional[int]:
+        """Returns the index of the layer mobj is in, or None."""
+        return self.parents.layer_of(mobj)
+
+    def skipping(self) -> bool:
+        """True if what is played now will not end up in the movie.
+
+        The helpers below then put things in their end state directly,
+        without building what is only needed to animate them.
+        """
+        return self.renderer.skipping()
 
     def set_code(self, cw: CodeWindow):
         self.add(cw)
@@ -67,15 +162,27 @@ class AnimatedCodeScene(MovingCameraScene):
     def set_variables(self, va: VariableArea):
         self.variables = va
 
-    def move_pc(self, line: int, start: int, end: int):
+    def move_pc(self, line, start=0, end=None):
+        # Tokens and AST paths are accepted too, see CodeWindow.locate()
+        line, start, end = self.code_window.locate(line, start, end)
         self.pc_loc = (line, start, end)
         target = self.code_window[f'line_{line}'][start:end]
+        # Long listings scroll to follow the PC
+        scroll = self.code_window.scroll_to(line)
+        offset = ORIGIN if scroll is None else scroll.scroll_shift
         if not self.pc:
             self.pc = create_pc(target)
+            self.pc.shift(offset)
             self.add(self.pc, layer=len(self.layers) - 1)
-            return Create(self.pc)
-        new_pc = create_pc(target)
-        return Transform(self.pc, new_pc)
+            anim = Create(self.pc)
+        elif self.skipping():
+            self.pc.set_bounds(*self.pc.bounds_around(target, offset))
+            anim = Applied(self.pc)
+        else:
+            anim = PCMove(self.pc, target, offset=offset)
+        if scroll is None:
+            return anim
+        return AnimationGroup(scroll, anim)
 
     def pc_end_scope(self, line: int, scope_type: str, indents=0,
                      with_anims=[]):
@@ -88,12 +195,12 @@ class AnimatedCodeScene(MovingCameraScene):
         else:
             assert False # unsupported
 
-        end_of_line = Rectangle(height=0.05, width=0.3, stroke_width=self.pc.stroke_width,
-                                color=PC_COLOR, name="Program Counter")
-        end_of_line.align_to(self.code_window[f'label_{line}'].get_bottom(), align)
+        width, height = 0.3, 0.05
+        bottom = self.code_window[f'label_{line}'].get_bottom()[1]
         # FIXME remove hard-coded indent width
-        end_of_line.align_to(self.code_window.code_area.get_left() + 0.32 * indents, LEFT)
-        self.play(Transform(self.pc, end_of_line), *with_anims)
+        left = self.code_window.code_area.get_left()[0] + 0.32 * indents
+        center = [left + width / 2, bottom + align[1] * -height / 2, 0]
+        self.play(PCMove(self.pc, bounds=(center, width, height, 0)), *with_anims)
 
     def create_variable(self, name: str, value,
                         source=None, shift_down: [Mobject] = [],
@@ -107,6 +214,25 @@ class AnimatedCodeScene(MovingCameraScene):
         assert scope['shelf'] in scope.submobjects
 
         expand_anims, new_box, height_delta = scope.create_variable(name, value, where=where)
+        self.parents.index(new_box, parent=scope)
+
+        if self.skipping():
+            for mobj in shift_down:
+                mobj.shift(DOWN * height_delta)
+            if source:
+                self.remove(source)
+            if source or show_value:
+                new_box.set_opacity(1.0)
+            else:
+                for part in new_box.all_but_contents():
+                    part.set_opacity(1.0)
+            if move_pointer is not None:
+                expand_anims.append(move_pointer.relocate(
+                    new_box['contents'].get_bottom(),
+                    move_pointer.end if pointer_target is None else pointer_target))
+            self.play(*expand_anims, Applied(new_box))
+            return new_box
+
         for mobj in shift_down:
             expand_anims.append(mobj.animate.shift(DOWN * height_delta))
 
@@ -143,12 +269,68 @@ class AnimatedCodeScene(MovingCameraScene):
                           run_time=1.0)
         return new_box
 
+    def create_variables(self, variables: [tuple], shift_down: [Mobject] = [],
+                         show_value=True, run_time=1.0) -> [VariableBox]:
+        """Creates several variables in a single animation.
+
+        variables are (name, value) or (name, value, source). The shelf grows
+        once for all of them, while the boxes appear and the sources move in.
+        """
+        scope = self.variables.top_scope()
+        # Make sure the VGroup has not been disassembled
+        assert scope['shelf'] in scope.submobjects
+        for name, *_ in variables:
+            assert name not in scope, name
+
+        anims, new_boxes, height_delta = scope.create_variables(
+            [(name, value) for name, value, *_ in variables])
+        for new_box in new_boxes:
+            self.parents.index(new_box, parent=scope)
+
+        skipping = self.skipping()
+        for mobj in shift_down:
+            if skipping:
+                mobj.shift(DOWN * height_delta)
+            else:
+                anims.append(mobj.animate.shift(DOWN * height_delta))
+
+        for (name, value, *source), new_box in zip(variables, new_boxes):
+            source = source[0] if source else None
+            if skipping:
+                if source:
+                    self.remove(source)
+                for part in new_box.all_but_contents():
+                    part.set_opacity(1.0)
+                if source or show_value:
+                    new_box['contents'].set_opacity(1.0)
+                anims.append(Applied(new_box))
+                continue
+
+            # Animate each part individually, otherwise Manim will add the
+            # VGroup of them all, breaking apart the scope
+            anims += [part.animate.set_opacity(1.0) for part in new_box.all_but_contents()]
+            if source:
+                new_box['contents'].set_opacity(1)
+                target_contents = new_box['contents'].copy()
+                new_box['contents'].become(source)
+                self.remove(source)
+                anims.append(Transform(new_box['contents'], target_contents))
+            elif show_value:
+                anims.append(new_box['contents'].animate.set_opacity(1.0))
+
+        self.play(*anims, run_time=run_time)
+        return new_boxes
+
     def update_variable(self, name, new_content, source):
         # TODO may need to resize shelf
         existing_box = self.variables.top_scope()[name]
         assert existing_box
 
         self.remove(source)
+        if self.skipping():
+            existing_box.set_contents(new_content)
+            self.play(Applied(existing_box))
+            return
         self.play(*existing_box.update_contents(new_content, source))
 
     def numeric_calculation(self, first_name, second_name, operation,
@@ -207,6 +389,7 @@ class AnimatedCodeScene(MovingCameraScene):
             loc = self.pc_loc
         else:
             assert len(loc) == 3
+            loc = self.code_window.locate(*loc)
         return self.code_window.highlight_scope(scope_type, lines, indents,
                                                 loc[0], loc[1], loc[2])
 
@@ -223,6 +406,18 @@ class AnimatedCodeScene(MovingCameraScene):
         user_fn.next_to(anchor, DOWN, buff=INTRA_FUNCTION_BUFFER)
         user_fn.set_opacity(0)
         self.functions.add(user_fn)
+        self.parents.index(user_fn, parent=self.functions)
+
+        if self.skipping():
+            parts = [user_fn['box'], user_fn['label']]
+            parts += [user_fn[f'input_{i}'] for i in range(1, user_fn.num_inputs + 1)]
+            if user_fn.num_outputs > 0:
+                parts.append(user_fn['output_1'])
+            for part in parts:
+                part.set_opacity(1.0)
+            self.play(Applied(user_fn))
+            return
+
         self.play(user_fn['box'].animate.set_opacity(1))
 
         code_copy = code_group.copy().scale_to_fit_width(user_fn['box'].width - 0.1)
@@ -314,19 +509,5 @@ class AnimatedCodeScene(MovingCameraScene):
         return self.variables.top_scope()[name]
 
 
-def remove_without_degrouping(mobjects: [Mobject], target: Mobject):
-    if target in mobjects:
-        mobjects.remove(target)
-        return True
-    for m in mobjects:
-        if remove_without_degrouping(m.submobjects, target):
-            return True
-    return False
-
-
-def create_pc(target: Mobject):
-    return SurroundingRectangle(target,
-                                buff=0.07,
-                                color=PC_COLOR,
-                                corner_radius=0.1,
-                                name="Program Counter")
+def create_pc(target: Mobject) -> ProgramCounter:
+    return ProgramCounter(target, buff=0.07, corner_radius=0.1)
@@ -0,0 +1,161 @@
+"""Renders straight into a single video, with no partial movie files.
+
+Normally every play() is encoded into a partial movie file of its own,
+and once the scene is over they are all joined into the scene's video,
+which render.py joins with the other scenes of the episode. Here one
+ffmpeg process is started for the whole episode instead, and the frames
+of every scene are piped into it as they are drawn.
+
+Nothing is written twice, but there is nothing to cache or to resume
+from either, and scenes can only be rendered one after the other. See
+render.stream_module().
+
+Every scene and section starts a chapter. The chapters are written in
+ffmpeg's metadata format next to the video, and can be added to it with
+
+    ffmpeg -i episode.mp4 -i episode.mp4.chapters.txt -map_metadata 1 -c copy out.mp4
+"""
+from manim import *
+from manim import __version__ as MANIM_VERSION
+
+import functools
+import subprocess
+
+from pathlib import Path
+from typing import Optional
+
+CHAPTERS_SUFFIX = '.chapters.txt'
+
+
+class StreamEncoder:
+    """A single ffmpeg process that the frames of several scenes go into."""
+
+    def __init__(self, output_file, chapters=True):
+        self.output_file = Path(output_file)
+        self.chapters_path = (self.output_file.with_name(self.output_file.name + CHAPTERS_SUFFIX)
+                              if chapters else None)
+        self.frames = 0
+        # (first frame, title)
+        self.markers: [(int, str)] = []
+        self.process: Optional[subprocess.Popen] = None
+
+    def file_writer_class(self):
+        """What to give a renderer as its file_writer_class."""
+        return functools.partial(StreamingFileWriter, encoder=self)
+
+    def open(self):
+        assert self.process is None, "Encoder already open"
+        self.output_file.parent.mkdir(parents=True, exist_ok=True)
+        fps = config.frame_rate
+        if fps == int(fps):
+            fps = int(fps)
+        # The same settings as SceneFileWriter.open_movie_pipe()
+        command = [
+            config.ffmpeg_executable,
+            '-y',
+            '-f', 'rawvideo',
+            '-s', f'{config.pixel_width}x{config.pixel_height}',
+            '-pix_fmt', 'rgba',
+            '-r', str(fps),
+            '-i', '-',
+            '-an',
+            '-loglevel', config.ffmpeg_loglevel.lower(),
+            '-metadata', f'comment=Rendered with Manim Community v{MANIM_VERSION}',
+        ]
+        if self.output_file.suffix == '.webm':
+            command += ['-vcodec', 'libvpx-vp9', '-auto-alt-ref', '0']
+        elif config.transparent:
+            command += ['-vcodec', 'qtrle']
+        else:
+            command += ['-vcodec', 'libx264', '-pix_fmt', 'yuv420p']
+        command += [str(self.output_file)]
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+        return self
+
+    def write(self, frame: np.ndarray):
+        self.process.stdin.write(frame.tobytes())
+        self.frames += 1
+
+    def mark(self, title: str):
+        """Starts a chapter at the next frame."""
+        self.markers.append((self.frames, title))
+
+    def close(self):
+        if self.process is None:
+            return
+        self.process.stdin.close()
+        returncode = self.process.wait()
+        self.process = None
+        assert returncode == 0, f"ffmpeg failed writing {self.output_file}"
+        if self.chapters_path is not None:
+            self.chapters_path.write_text(self.chapters())
+        logger.info(f"{self.frames} frames written to {self.output_file}")
+
+    def chapters(self) -> str:
+        """The markers as an FFMETADATA file, leaving out the empty chapters."""
+        lines = [';FFMETADATA1']
+        ends = [start for start, _ in self.markers[1:]] + [self.frames]
+        for (start, title), end in zip(self.markers, ends):
+            if end <= start:
+                continue
+            lines += [
+                '[CHAPTER]',
+                f'TIMEBASE=1/{config.frame_rate:g}',
+                f'START={start}',
+                f'END={end}',
+                f'title={_escape(title)}',
+            ]
+        return '\n'.join(lines) + '\n'
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _escape(value: str) -> str:
+    for special in '\\=;#\n':
+        value = value.replace(special, '\\' + special)
+    return value
+
+
+class StreamingFileWriter(SceneFileWriter):
+    """Sends the frames of a scene to a StreamEncoder.
+
+    There are no partial movies: plays are not cached, and nothing is left
+    to combine when the scene is over.
+    """
+
+    def __init__(self, renderer, scene_name, encoder: StreamEncoder, **kwargs):
+        # Needed by the first next_section(), in super().__init__()
+        self.encoder = encoder
+        self.scene_name = scene_name
+        super().__init__(renderer, scene_name, **kwargs)
+
+    def next_section(self, name: str, type: str, skip_animations: bool):
+        super().next_section(name, type, skip_animations)
+        self.encoder.mark(self.scene_name if name == 'autocreated'
+                          else f'{self.scene_name}: {name}')
+
+    def add_partial_movie_file(self, hash_animation: str):
+        # Keeps the lists of partial movies in step with the plays
+        super().add_partial_movie_file(None)
+
+    def is_already_cached(self, hash_invocation: str):
+        return False
+
+    def begin_animation(self, allow_write=False, file_path=None):
+        pass
+
+    def end_animation(self, allow_write=False):
+        pass
+
+    def write_frame(self, frame: np.ndarray):
+        if write_to_movie():
+            self.encoder.write(frame)
+
+    def finish(self):
+        assert not self.includes_sound, "Sound is not supported when streaming"
+        if self.subcaptions:
+            self.write_subcaption_file()
@@ -0,0 +1,296 @@
+"""Animate a listing by actually running it.
+
+record_trace() runs the source shown in a CodeWindow under sys.settrace and
+keeps a compact log of what happened: which line ran, which variables were
+created or changed by it, and which functions were called and returned.
+TraceDriver then plays that log back on an AnimatedCodeScene, moving the
+PC, creating and updating variables and pushing/popping scopes, instead of
+scripting every step by hand.
+
+Logs can be saved and loaded again, so a scene does not have to re-run the
+program to replay it.
+"""
+from manim import *
+
+import copy
+import dis
+import inspect
+import json
+import sys
+
+from typing import NamedTuple, Optional
+
+from manim_ace.scene import AnimatedCodeScene, create_pc
+from manim_ace.variables import code_value
+
+TRACE_FILENAME = '<manim_ace>'
+
+
+class TraceEvent(NamedTuple):
+    # One of 'line', 'assign', 'call', 'return', 'yield' or 'resume'
+    kind: str
+    # Line in the listing, numbered the way CodeWindow numbers them
+    line: int
+    # 'assign': variable name, otherwise the function's name
+    name: str = ''
+    # 'assign': the new value, 'call': the arguments, 'return': the result,
+    # 'yield': the value yielded, 'resume': the variables of the generator
+    value: object = None
+
+
+# Code whose frames can be suspended and resumed
+_GENERATOR_FLAGS = inspect.CO_GENERATOR | inspect.CO_COROUTINE | inspect.CO_ASYNC_GENERATOR
+_YIELD_VALUE = dis.opmap['YIELD_VALUE']
+
+
+def _snapshot(value):
+    try:
+        return copy.deepcopy(value)
+    except Exception:
+        return value
+
+
+def _same(a, b, seen=None) -> bool:
+    """Whether two snapshots hold the same value.
+
+    Snapshots are copies, so objects that do not define == are compared
+    by their attributes, and values == does not give a truth value for
+    (numpy arrays, say) by their repr().
+    """
+    if a is b:
+        return True
+    if type(a) is not type(b):
+        return False
+    if seen is None:
+        seen = set()
+    if (id(a), id(b)) in seen:
+        # Already being compared further up
+        return True
+    seen.add((id(a), id(b)))
+    if isinstance(a, (list, tuple)):
+        return len(a) == len(b) and all(_same(x, y, seen) for x, y in zip(a, b))
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(_same(a[key], b[key], seen) for key in a)
+    if type(a).__eq__ is object.__eq__:
+        if hasattr(a, '__dict__'):
+            return _same(vars(a), vars(b), seen)
+        return repr(a) == repr(b)
+    try:
+        return bool(a == b)
+    except Exception:
+        return repr(a) == repr(b)
+
+
+def _is_variable(name: str, value) -> bool:
+    # '.0' and the like are the hidden iterators of comprehensions
+    if name.startswith('__') or name.startswith('.'):
+        return False
+    # Functions, classes and modules are not what we show in the variable area
+    return not (callable(value) or type(value).__name__ == 'module')
+
+
+def record_trace(source: str, start_at_line=1, max_events=100000) -> [TraceEvent]:
+    """Runs source and returns what happened, line by line."""
+    # Code (via Pygments) drops the leading newlines of a listing, so the
+    # first displayed line is not necessarily line 1 of the source.
+    leading = len(source) - len(source.lstrip('\n'))
+    line_offset = start_at_line - 1 - leading
+
+    events = []
+    # The last seen locals of every live frame, to find what a line changed
+    last_locals = {}
+    last_line = {}
+    # Generator frames waiting for their next() and frames an exception
+    # is going through
+    suspended = set()
+    raising = set()
+    # Generator frames being closed rather than resumed, and where the
+    # 'resume' of every resumed one is in events
+    closing = set()
+    resumed = {}
+
+    def record(kind, line, name='', value=None):
+        if len(events) >= max_events:
+            raise RuntimeError(f"Trace is longer than {max_events} events")
+        events.append(TraceEvent(kind, line + line_offset, name, value))
+
+    def record_changes(frame):
+        before = last_locals.get(id(frame), {})
+        now = {}
+        for name, value in frame.f_locals.items():
+            if not _is_variable(name, value):
+                continue
+            now[name] = _snapshot(value)
+            if name not in before or not _same(before[name], now[name]):
+                record('assign', last_line[id(frame)], name, now[name])
+        last_locals[id(frame)] = now
+
+    def record_inline(frame, event):
+        # Comprehensions, generator expressions and lambdas are part of
+        # the line that uses them: only the lines they go through count,
+        # and not once per item.
+        if event == 'line':
+            line = frame.f_lineno
+        elif event == 'return' and frame.f_back.f_code.co_filename == TRACE_FILENAME:
+            # Back to the line using it, say after a lambda written elsewhere
+            line = frame.f_back.f_lineno
+        else:
+            return
+        if not (events and events[-1].kind == 'line' and events[-1].line == line + line_offset):
+            record('line', line)
+
+    def forget(frame):
+        last_locals.pop(id(frame), None)
+        last_line.pop(id(frame), None)
+        raising.discard(id(frame))
+        resumed.pop(id(frame), None)
+
+    def tracer(frame, event, arg):
+        code = frame.f_code
+        if code.co_filename != TRACE_FILENAME:
+            return None
+        is_module = code.co_name == '<module>'
+        if code.co_name.startswith('<') and not is_module:
+            record_inline(frame, event)
+            return tracer
+        if id(frame) in closing:
+            # Nothing it does while closing happened as far as the listing
+            # is concerned, it was dropped at its last yield
+            if event == 'return':
+                closing.remove(id(frame))
+                forget(frame)
+            return tracer
+        if event == 'call':
+            last_line[id(frame)] = frame.f_lineno
+            if id(frame) in suspended:
+                suspended.remove(id(frame))
+                resumed[id(frame)] = len(events)
+                record('resume', frame.f_lineno, code.co_name, dict(last_locals[id(frame)]))
+            elif not is_module:
+                args = {name: _snapshot(value) for name, value in frame.f_locals.items()}
+                record('call', frame.f_lineno, code.co_name, args)
+                last_locals[id(frame)] = args
+        elif event == 'line':
+            raising.discard(id(frame))
+            resumed.pop(id(frame), None)
+            if id(frame) in last_line:
+                record_changes(frame)
+            record('line', frame.f_lineno)
+            last_line[id(frame)] = frame.f_lineno
+        elif event == 'exception':
+            if (arg[0] is GeneratorExit
+                    and resumed.pop(id(frame), None) == len(events) - 1):
+                # close(), as when an unfinished generator is dropped: it
+                # was not really resumed
+                del events[-1]
+                closing.add(id(frame))
+                return tracer
+            raising.add(id(frame))
+        elif event == 'return':
+            record_changes(frame)
+            if (code.co_flags & _GENERATOR_FLAGS and id(frame) not in raising
+                    and code.co_code[frame.f_lasti] == _YIELD_VALUE):
+                # Back on the next next(), with the same frame
+                suspended.add(id(frame))
+                record('yield', frame.f_lineno, code.co_name, _snapshot(arg))
+                return tracer
+            if not is_module:
+                record('return', frame.f_lineno, code.co_name, _snapshot(arg))
+            forget(frame)
+        return tracer
+
+    code = compile(source, TRACE_FILENAME, 'exec')
+    old_trace = sys.gettrace()
+    sys.settrace(tracer)
+    try:
+        exec(code, {'__name__': '__manim_ace__'})
+    finally:
+        sys.settrace(old_trace)
+    return events
+
+
+def save_trace(events: [TraceEvent], path):
+    """Writes a trace as JSON. Values JSON cannot hold are saved as their repr()."""
+    def default(value):
+        return repr(value)
+    with open(path, 'w') as f:
+        json.dump([list(event) for event in events], f, default=default)
+
+
+def load_trace(path) -> [TraceEvent]:
+    with open(path) as f:
+        return [TraceEvent(*event) for event in json.load(f)]
+
+
+class TraceDriver:
+    """Plays a trace back on an AnimatedCodeScene.
+
+    The scene needs a CodeWindow and a VariableArea set already. Lines that
+    are not part of the displayed listing are skipped.
+    """
+
+    def __init__(self, scene: AnimatedCodeScene, events: [TraceEvent],
+                 wait: float = 0.2):
+        self.scene = scene
+        self.events = events
+        self.wait = wait
+        self.position = 0
+        # Lines of the calls that are currently active
+        self.call_lines = []
+
+    def _shown(self, line: int) -> bool:
+        code = self.scene.code_window
+        return f'line_{line}' in code and len(code[f'line_{line}']) > 0
+
+    def done(self) -> bool:
+        return self.position >= len(self.events)
+
+    def step(self):
+        """Plays the next event."""
+        event = self.events[self.position]
+        self.position += 1
+        scene = self.scene
+        code = scene.code_window
+
+        if event.kind == 'line':
+            if self._shown(event.line):
+                scene.play(scene.move_pc(event.line, 0, None))
+                scene.wait(self.wait)
+        elif event.kind == 'assign':
+            if event.name not in scene.variables.top_scope():
+                scene.create_variable(event.name, event.value)
+            else:
+                source = code_value(event.value)
+                if self._shown(event.line):
+                    source.next_to(code[f'line_{event.line}'], RIGHT, buff=0.2)
+                scene.update_variable(event.name, event.value, source)
+        elif event.kind in ('call', 'resume'):
+            caller_line = scene.pc_loc[0]
+            self.call_lines.append(caller_line)
+            scene.play(scene.variables.push_variable_stack())
+            # Starts from the line making the call, unless there is no such
+            # line to be seen (yet)
+            pc_line = caller_line if self._shown(caller_line) else event.line
+            init_pc = create_pc(code[f'line_{pc_line}'])
+            scene.play(scene.push_pc(event.line, 0, None, init_pc))
+            for name, value in event.value.items():
+                scene.create_variable(name, value)
+        elif event.kind in ('return', 'yield'):
+            scene.variables.pop_variable_stack(scene)
+            scene.pop_pc()
+            self.call_lines.pop()
+        else:
+            assert False, event.kind
+
+    def run(self, until_line: Optional[int] = None, max_events: Optional[int] = None):
+        """Plays events until the trace ends, the PC reaches until_line or
+        max_events have been played."""
+        played = 0
+        while not self.done():
+            if max_events is not None and played >= max_events:
+                return
+            event = self.events[self.position]
+            if event.kind == 'line' and event.line == until_line and played > 0:
+                return
+            self.step()
+            played += 1
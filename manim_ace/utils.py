@@ -1,7 +1,11 @@
 from manim import *
 
+from manim_ace.pc import PCMove, ProgramCounter
+
 def surround(origRect, targetMobj, offset=ORIGIN):
     """Reshapes one SurroundingRectangle around another mobject."""
+    if isinstance(origRect, ProgramCounter):
+        return PCMove(origRect, targetMobj, offset=offset)
     new_box = SurroundingRectangle(targetMobj, color=origRect.color,
                                    buff=origRect.buff,
                                    stroke_width=origRect.stroke_width,
@@ -12,6 +16,20 @@ def surround(origRect, targetMobj, offset=ORIGIN):
     return Transform(origRect, new_box)
 
 
+class Applied(Animation):
+    """Stands in for an animation whose end state was already applied.
+
+    Helpers return this instead of their animation while skipping (see
+    AnimatedCodeScene.skipping()), so callers can still play() it.
+    """
+
+    def create_starting_mobject(self) -> Mobject:
+        return self.mobject
+
+    def interpolate_mobject(self, alpha: float):
+        pass
+
+
 def occlude(mobj, width=None, buff=0):
     """Return a white, transparent rectangle around a mobject."""
     if not width:
@@ -1,97 +1,156 @@
 from manim import *
 
+from functools import lru_cache
+from typing import NamedTuple
+
 from manim_ace.colors import LIGHT_BROWN
 from manim_ace.fonts import LM_MONO, ROBOTO_MONO
+from manim_ace.glyphs import cached_text
 from manim_ace.lists import List
 
 SHELF_COLOR = LIGHT_BROWN
 
 
+# Spacing inside a VariableBox
+NAME_GAP = 0.3  # between name and value
+BOX_MARGIN_H = 0.3
+BOX_MARGIN_V = 0.2
+
+
+class BoxLayout(NamedTuple):
+    """Where the parts of a VariableBox go, relative to its UL corner."""
+    width: float
+    height: float
+    name_dl: np.ndarray
+    contents_dl: np.ndarray
+    divider_x: float
+    divider_height: float
+
+
+def box_layout(name_size, contents_size, name_dips: bool, contents_dips: bool) -> BoxLayout:
+    """Lays out a VariableBox from the (width, height) of its name and
+    contents, and whether they have letters below the baseline."""
+    name_w, name_h = name_size
+    contents_w, contents_h = contents_size
+
+    # Keep baseline alignment consistent for descenders
+    if name_dips == contents_dips:
+        baseline = 0.01
+    elif name_dips and not contents_dips:
+        baseline = 0.05
+    else:
+        baseline = -0.05
+
+    # With the DL corner of the name at the origin
+    top = max(name_h, baseline + contents_h)
+    bottom = min(0, baseline)
+    text_width = name_w + NAME_GAP + contents_w
+    text_height = top - bottom
+
+    y = -(top + BOX_MARGIN_V)
+    return BoxLayout(
+        width=text_width + 2 * BOX_MARGIN_H,
+        height=text_height + 2 * BOX_MARGIN_V,
+        name_dl=np.array([BOX_MARGIN_H, y, 0]),
+        contents_dl=np.array([BOX_MARGIN_H + name_w + NAME_GAP, y + baseline, 0]),
+        divider_x=BOX_MARGIN_H + name_w + NAME_GAP / 2,
+        divider_height=text_height,
+    )
+
+
+@lru_cache(maxsize=16)
+def _divider_template(height: float) -> DashedLine:
+    return DashedLine(UP * (height / 2), DOWN * (height / 2),
+                      color=BLACK, stroke_width=1)
+
+
+def divider(height: float) -> DashedLine:
+    return _divider_template(round(height, 4)).copy()
+
+
+def contents_str(value) -> str:
+    """How value is written in a VariableBox."""
+    if isinstance(value, str):
+        return '"' + value + '"'
+    elif isinstance(value, List):
+        return '<list>'
+    return str(value)
+
+
 class VariableBox(VDict):
     def __init__(self, name: str, value):
         super().__init__()
         self.name = name
         self.value = value
-        contents = str(value)
-        if isinstance(value, str):
-            contents = '"' + value + '"'
-        elif isinstance(value, List):
-            contents = '<list>'
+        contents = contents_str(value)
 
-        nameT = Text(name, color=BLACK, font_size=18, font=ROBOTO_MONO)
+        nameT = cached_text(name, ROBOTO_MONO, 18)
         contentsT = code_value(contents)
+        layout = box_layout((nameT.width, nameT.height),
+                            (contentsT.width, contentsT.height),
+                            has_dipping_char(name), has_dipping_char(contents))
 
-        horizontal_gap = 0.3  # spacing between name and value
-        contentsT.next_to(nameT, RIGHT, buff=horizontal_gap)
-
-        # Keep baseline alignment consistent for descenders
-        hd_name, hd_contents = has_dipping_char(name), has_dipping_char(contents)
-        if hd_name == hd_contents:
-            contentsT.align_to(nameT, DOWN).shift(UP * 0.01)
-        elif hd_name and not hd_contents:
-            contentsT.align_to(nameT, DOWN).shift(UP * 0.05)
-        else:
-            contentsT.align_to(nameT, DOWN).shift(DOWN * 0.05)
-
-        text_group = VGroup(nameT, contentsT)
-
-        margin_h = 0.3
-        margin_v = 0.2
-        box_width = text_group.width + 2 * margin_h
-        box_height = max(text_group.height, nameT.height, contentsT.height) + 2 * margin_v
-
-        box = Rectangle(height=box_height,
-                        width=box_width,
+        box = Rectangle(height=layout.height,
+                        width=layout.width,
                         fill_color=WHITE, fill_opacity=1.0,
                         color=BLACK, stroke_width=1)
-
-        text_group.align_to(box, UL)
-        text_group.shift(RIGHT * margin_h + DOWN * margin_v)
-
-        top_inside = box.get_top()[1] - margin_v
-        bottom_inside = box.get_bottom()[1] + margin_v
-        divider_x = nameT.get_right()[0] + (horizontal_gap / 2)
-        divider_height = top_inside - bottom_inside
-        divider = DashedLine(
-            UP * (divider_height / 2),
-            DOWN * (divider_height / 2),
-            color=BLACK,
-            stroke_width=1
-        )
-        divider.move_to([divider_x, (top_inside + bottom_inside) / 2, 0])
+        ul = box.get_corner(UL)
+        nameT.move_to(ul + layout.name_dl, DL)
+        contentsT.move_to(ul + layout.contents_dl, DL)
+        line = divider(layout.divider_height)
+        line.move_to(ul + [layout.divider_x, -layout.height / 2, 0])
 
         self.add([
             ('box', box),
             ('name', nameT),
             ('contents', contentsT),
-            ('divider', divider),
+            ('divider', line),
         ])
 
     def all_but_contents(self):
         return [self['box'], self['name'], self['divider']]
 
+    def _targets(self, new_value) -> (Rectangle, Mobject):
+        """The box and contents that new_value would have."""
+        contents = contents_str(new_value)
+        contentsT = code_value(contents)
+        name = self['name']
+        layout = box_layout((name.width, name.height),
+                            (contentsT.width, contentsT.height),
+                            has_dipping_char(self.name), has_dipping_char(contents))
+
+        ul = self.get_corner(UL)
+        box = self['box'].copy()
+        box.stretch_to_fit_width(layout.width).stretch_to_fit_height(layout.height)
+        box.move_to(ul, UL)
+        contentsT.move_to(ul + layout.contents_dl, DL)
+        return box, contentsT
+
+    def set_contents(self, new_value):
+        """Where update_contents() ends up, without animating."""
+        self.value = new_value
+
+        box, contents = self._targets(new_value)
+        self['box'].become(box)
+        self['contents'].become(contents)
+
     def update_contents(self, new_value, source):
         self.value = new_value
 
-        new_box = VariableBox(self.name, new_value)
-        new_box.align_to(self.get_corner(UL), UL)
+        box, contents = self._targets(new_value)
 
         prev_contents = self['contents'].copy()
         self['contents'].become(source)
 
         return [
-            Transform(self['box'], new_box['box']),
-            Transform(self['contents'], new_box['contents']),
+            Transform(self['box'], box),
+            Transform(self['contents'], contents),
             FadeOut(prev_contents),
         ]
 
 
 def code_value(contents, replace_spaces=False):
-    contents = str(contents)
-    if replace_spaces:
-        return TextWithSpaces(contents, color=BLACK, font_size=18, font=LM_MONO)
-    else:
-        return Text(contents, color=BLACK, font_size=18, font=LM_MONO)
+    return cached_text(contents, LM_MONO, 18, replace_spaces=replace_spaces)
 
 
 def has_dipping_char(s):
@@ -125,6 +184,18 @@ class VariableScope(VDict):
         self.variable_boxes = {}
 
     def create_variable(self, name: str, value, where=None) -> (Animation, VariableBox, float):
+        new_box = self._place_variable(name, value, where)
+        expand_anims, height_delta = self._expand_shelf()
+        return expand_anims, new_box, height_delta
+
+    def create_variables(self, variables: [tuple]) -> ([Animation], [VariableBox], float):
+        """Like create_variable() for each of variables, which are (name, value)
+        or (name, value, where), but the shelf only grows once."""
+        new_boxes = [self._place_variable(*variable) for variable in variables]
+        expand_anims, height_delta = self._expand_shelf()
+        return expand_anims, new_boxes, height_delta
+
+    def _place_variable(self, name: str, value, where=None) -> VariableBox:
         if self.vars_per_row == 1:
             if where is None:
                 where = len(self.variable_boxes)
@@ -173,7 +244,10 @@ class VariableScope(VDict):
         # Too complex and probably a bit confusion.
         assert where not in self.variable_boxes, (where, self.variable_boxes)
         self.variable_boxes[where] = new_box
+        return new_box
 
+    def _expand_shelf(self) -> ([Animation], float):
+        """Grows the shelf to fit all the variable boxes."""
         width = max(self.min_variables_width,
                     max([x['box'].width + 0.2 for x in self.variable_boxes.values()]))
 
@@ -186,12 +260,12 @@ class VariableScope(VDict):
                            stroke_width=2, fill_opacity=1.0,
                            name='shelf2')
         if shelf2.width <= self['shelf'].width and shelf2.height <= self['shelf'].height:
-            return [], new_box, 0
+            return [], 0
         shelf2.align_to(self['shelf'], direction=UL)
         height_delta = shelf2.height - self['shelf'].height
         expand_anims = [Transform(self['shelf'], shelf2)]
 
-        return expand_anims, new_box, height_delta
+        return expand_anims, height_delta
 
     # It is perfectly ok to add mobjects to a scope. It makes it
     # easier to clean things up when they go out of scope.
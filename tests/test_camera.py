@@ -0,0 +1,40 @@
+import pytest
+
+pytest.importorskip("manim")
+
+from manim import *
+
+from manim_ace.camera import LayerCamera
+from manim_ace.renderer import AceRenderer
+
+
+class TwoLayers(MovingCameraScene):
+    def construct(self):
+        self.still = Square()
+        self.moving = Circle()
+        self.layers = [Group(self.still), Group(self.moving)]
+        self.add(*self.layers)
+        self.camera.layers = self.layers
+        self.play(self.moving.animate.shift(RIGHT), run_time=0.2)
+        self.play(self.moving.animate.shift(LEFT), run_time=0.2)
+
+
+def test_unchanged_layer_is_reused_between_plays():
+    with tempconfig({'dry_run': True, 'disable_caching': True, 'frame_rate': 10,
+                     'pixel_width': 160, 'pixel_height': 90}):
+        scene = TwoLayers(renderer=AceRenderer(camera_class=LayerCamera))
+        camera = scene.camera
+        drawn = []
+        display = camera.display_funcs[VMobject]
+
+        def record(vmobjects, pixel_array):
+            drawn.extend(vmobjects)
+            display(vmobjects, pixel_array)
+
+        camera.display_funcs[VMobject] = record
+        scene.render()
+
+    # Drawn into the static frame of the first play() only
+    assert sum(m is scene.still for m in drawn) == 1
+    assert sum(m is scene.moving for m in drawn) > 2
+    assert len(camera._layer_frames) == 1
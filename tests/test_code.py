@@ -0,0 +1,35 @@
+import pytest
+
+pytest.importorskip("manim")
+
+from manim import *
+
+from manim_ace.code import LINE_NO_ONE_NUDGE, CodeWindow
+
+# Line numbers ending in 1 are the ones Code gets wrong, and the code
+# has 1s in it too
+SOURCE = '\n'.join(f'x_{i} = {i}1' for i in range(12))
+
+
+@pytest.mark.parametrize('visible_lines', [None, 5])
+def test_direct_glyphs_are_where_code_puts_them(visible_lines):
+    code = CodeWindow(SOURCE, visible_lines=visible_lines)
+    direct = CodeWindow(SOURCE, visible_lines=visible_lines, direct_glyphs=True)
+    # The windows are centered differently
+    code_origin = code['line_1'][0].get_center()
+    direct_origin = direct['line_1'][0].get_center()
+
+    for line in (1, 10, 11):
+        for key in (f'label_{line}', f'line_{line}'):
+            atol = 0.02
+            if key.startswith('label') and line % 10 == 1:
+                # _tidy_line() moves these by a hand picked amount, to
+                # about where the character grid has them
+                atol += LINE_NO_ONE_NUDGE
+            assert len(code[key]) == len(direct[key])
+            for a, b in zip(code[key], direct[key]):
+                if isinstance(b, VectorizedPoint):
+                    # A space, which Code does not place properly
+                    continue
+                np.testing.assert_allclose(b.get_center() - direct_origin,
+                                           a.get_center() - code_origin, atol=atol)
@@ -0,0 +1,43 @@
+from manim_ace.highlight import PALETTE_SWAP, default_color, highlight, indent
+
+SOURCE = '''
+for i in range(3):
+\tif i:
+        s = """a
+b"""
+'''
+
+
+def text(line_chars) -> str:
+    return ''.join(char for char, _ in line_chars)
+
+
+def test_lines_without_the_blank_ones_around_them():
+    lines = highlight(SOURCE)
+    assert [text(line) for line in lines] == [
+        'for i in range(3):',
+        '    if i:',
+        '        s = """a',
+        'b"""',
+    ]
+
+
+def test_glyphs_are_the_characters_after_the_indentation():
+    # A tab is as wide as tab_width spaces, and neither has glyphs
+    glyphs = [len(line) - indent(line) for line in highlight(SOURCE)]
+    assert [indent(line) for line in highlight(SOURCE)] == [0, 4, 8, 0]
+    assert glyphs == [18, 5, 8, 4]
+    assert indent(highlight('\tx = 1', tab_width=2)[0]) == 2
+
+
+def test_strings_keep_their_color_across_lines():
+    lines = highlight(SOURCE)
+    string_color = lines[2][-1][1]
+    assert string_color != default_color()
+    assert {color for _, color in lines[3]} == {string_color}
+
+
+def test_palette_is_swapped():
+    colors = {color for line in highlight(SOURCE) for _, color in line}
+    assert not colors & set(PALETTE_SWAP)
+    assert colors & set(PALETTE_SWAP.values())
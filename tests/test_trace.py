@@ -0,0 +1,18 @@
+import pytest
+
+pytest.importorskip("manim")
+
+from manim_ace.trace import record_trace
+
+NEXT_OF_NEW_GENERATOR = '''\
+def g():
+    yield 1
+for i in range(2):
+    x = next(g())
+'''
+
+
+def test_dropped_generator_is_not_resumed():
+    events = record_trace(NEXT_OF_NEW_GENERATOR)
+    kinds = [(event.kind, event.name) for event in events if event.name == 'g']
+    assert kinds == [('call', 'g'), ('yield', 'g')] * 2